@@ -13,12 +13,17 @@ from typing import List, Optional
 import sys
 import os
 import asyncio
+import logging
 from dotenv import load_dotenv
 from pathlib import Path
 
 # Load environment variables
 load_dotenv()
 
+# Show the engine's step-by-step progress on the console
+logging.basicConfig(format="%(message)s", stream=sys.stdout)
+logging.getLogger("testgpt_engine").setLevel(logging.INFO)
+
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
@@ -312,10 +317,17 @@ def execute_test_in_background(
         try:
             # Execute the test
             print(" Calling TestGPT engine.process_test_request()...")
-            slack_summary = asyncio.run(engine.process_test_request(
-                slack_message=slack_message,
-                user_id="api-user"
-            ))
+            async def run_test():
+                try:
+                    return await engine.process_test_request(
+                        slack_message=slack_message,
+                        user_id="api-user"
+                    )
+                finally:
+                    # Let background MCP cleanup and DB saves finish before the loop closes
+                    await engine.drain()
+
+            slack_summary = asyncio.run(run_test())
             print(f" Test execution completed: {slack_summary[:100]}...")
 
             # Update execution with success
@@ -586,7 +598,7 @@ async def migrate_json_to_db(db: Session = Depends(get_db)):
     # Read full scenario files directly
     for file_path in scenarios_dir.glob("*.json"):
         try:
-            with open(file_path, 'r') as f:
+            with open(file_path, 'r', encoding='utf-8') as f:
                 scenario_dict = json.load(f)
         except Exception as e:
             errors.append({"file": str(file_path), "error": f"Failed to read file: {str(e)}"})
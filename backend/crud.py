@@ -211,15 +211,12 @@ def delete_config_template(db: Session, config_id: str) -> bool:
 # TEST EXECUTION CRUD
 # ============================================================================
 
-def create_test_execution(
-    db: Session, execution: TestExecutionCreate
-) -> TestExecution:
-    """Create a new test execution"""
-    db_execution = TestExecution(
+def _new_test_execution(execution: TestExecutionCreate, **fields) -> TestExecution:
+    """Build a test execution row from the create schema plus extra column values"""
+    return TestExecution(
         id=f"exec-{uuid.uuid4().hex[:8]}",
         test_suite_id=execution.test_suite_id,
         config_id=execution.config_id,
-        status="pending",
         browser=execution.browser,
         viewport_width=execution.viewport_width,
         viewport_height=execution.viewport_height,
@@ -227,13 +224,52 @@ def create_test_execution(
         triggered_by=execution.triggered_by,
         triggered_by_user=execution.triggered_by_user,
         created_at=datetime.utcnow(),
+        **fields,
     )
+
+
+def create_test_execution(
+    db: Session, execution: TestExecutionCreate
+) -> TestExecution:
+    """Create a new test execution"""
+    db_execution = _new_test_execution(execution, status="pending")
     db.add(db_execution)
     db.commit()
     db.refresh(db_execution)
     return db_execution
 
 
+def create_completed_test_execution(
+    db: Session,
+    execution: TestExecutionCreate,
+    status: str,
+    started_at: Optional[datetime] = None,
+    completed_at: Optional[datetime] = None,
+    execution_time_ms: Optional[float] = None,
+    execution_logs=None,
+    error_details: Optional[str] = None,
+) -> str:
+    """
+    Record a test execution that has already finished, with a single INSERT.
+
+    Returns the new execution's ID. The row isn't refreshed after the commit,
+    so the ID is read before it rather than from the expired instance.
+    """
+    db_execution = _new_test_execution(
+        execution,
+        status=status,
+        started_at=started_at,
+        completed_at=completed_at,
+        execution_time_ms=execution_time_ms,
+        execution_logs=execution_logs,
+        error_details=error_details,
+    )
+    execution_id = db_execution.id
+    db.add(db_execution)
+    db.commit()
+    return execution_id
+
+
 def get_test_execution(db: Session, execution_id: str) -> Optional[TestExecution]:
     """Get a test execution by ID"""
     return db.query(TestExecution).filter(TestExecution.id == execution_id).first()
@@ -14,10 +14,16 @@ import os
 DB_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "frontend", "lib", "db", "testgpt.db")
 SQLALCHEMY_DATABASE_URL = f"sqlite:///{DB_PATH}"
 
-# Create engine
+# Create engine. Sessions draw from a bounded connection pool shared by the
+# API, the Slack bot's worker threads and the PR persistence layer; stale
+# connections are checked before use.
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL,
-    connect_args={"check_same_thread": False}
+    connect_args={"check_same_thread": False},
+    pool_size=10,
+    max_overflow=5,
+    pool_timeout=30,
+    pool_pre_ping=True
 )
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
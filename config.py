@@ -243,37 +243,37 @@ def select_viewports_for_keywords(keywords: List[str]) -> List[str]:
 
     Rules from specification TODO 2.
     """
-    keywords_lower = [k.lower() for k in keywords]
+    keywords_lower = {k.lower() for k in keywords}
     selected = set()
 
     # Check for specific mentions
-    if any(k in keywords_lower for k in ["mobile"]):
+    if "mobile" in keywords_lower:
         selected.add("iphone-13-pro")
         selected.add("android-medium")
 
-    if any(k in keywords_lower for k in ["iphone", "ios"]):
+    if keywords_lower & {"iphone", "ios"}:
         selected.add("iphone-13-pro")
-        if any(k in keywords_lower for k in ["cheap", "budget", "small"]):
+        if keywords_lower & {"cheap", "budget", "small"}:
             selected.add("iphone-se")
 
-    if any(k in keywords_lower for k in ["android"]):
+    if "android" in keywords_lower:
         selected.add("android-medium")
-        if any(k in keywords_lower for k in ["cheap", "budget", "low-end", "small"]):
+        if keywords_lower & {"cheap", "budget", "low-end", "small"}:
             selected.add("android-small")
 
-    if any(k in keywords_lower for k in ["tablet", "ipad"]):
+    if keywords_lower & {"tablet", "ipad"}:
         selected.add("ipad-air")
 
-    if any(k in keywords_lower for k in ["desktop"]):
+    if "desktop" in keywords_lower:
         selected.add("desktop-standard")
 
-    if any(k in keywords_lower for k in ["responsive", "screen sizes", "aspect ratios"]):
+    if keywords_lower & {"responsive", "screen sizes", "aspect ratios"}:
         # Minimum 3-point coverage
         selected.add("iphone-13-pro")
         selected.add("ipad-air")
         selected.add("desktop-standard")
 
-    if any(k in keywords_lower for k in ["comprehensive"]):
+    if "comprehensive" in keywords_lower:
         # All viewports
         return list(VIEWPORT_PROFILES.keys())
 
@@ -290,22 +290,22 @@ def select_browsers_for_keywords(keywords: List[str], target_url: str = "") -> L
 
     Rules from specification TODO 3.
     """
-    keywords_lower = [k.lower() for k in keywords]
+    keywords_lower = {k.lower() for k in keywords}
     selected = set()
 
     # Check for specific browser mentions
-    if any(k in keywords_lower for k in ["safari", "webkit", "ios", "iphone", "ipad"]):
+    if keywords_lower & {"safari", "webkit", "ios", "iphone", "ipad"}:
         selected.add("webkit-desktop")
-        if any(k in keywords_lower for k in ["ios", "iphone", "mobile"]):
+        if keywords_lower & {"ios", "iphone", "mobile"}:
             selected.add("webkit-ios")
 
-    if any(k in keywords_lower for k in ["brave", "chrome", "chromium"]):
+    if keywords_lower & {"brave", "chrome", "chromium"}:
         selected.add("chromium-desktop")
 
-    if any(k in keywords_lower for k in ["firefox"]):
+    if "firefox" in keywords_lower:
         selected.add("firefox-desktop")
 
-    if any(k in keywords_lower for k in ["cross-browser"]):
+    if "cross-browser" in keywords_lower:
         selected.add("chromium-desktop")
         selected.add("webkit-desktop")
 
@@ -322,20 +322,20 @@ def select_networks_for_keywords(keywords: List[str]) -> List[str]:
 
     Rules from specification TODO 4.
     """
-    keywords_lower = [k.lower() for k in keywords]
+    keywords_lower = {k.lower() for k in keywords}
     selected = set()
 
     # Always include normal
     selected.add("normal")
 
     # Check for degraded network mentions
-    if any(k in keywords_lower for k in ["bad network", "slow network", "poor connection", "slow", "3g"]):
+    if keywords_lower & {"bad network", "slow network", "poor connection", "slow", "3g"}:
         selected.add("slow-3g")
 
-    if any(k in keywords_lower for k in ["flaky", "unstable", "edge case", "packet loss"]):
+    if keywords_lower & {"flaky", "unstable", "edge case", "packet loss"}:
         selected.add("flaky-edge")
 
-    if any(k in keywords_lower for k in ["network conditions", "under load"]):
+    if keywords_lower & {"network conditions", "under load"}:
         selected.add("slow-3g")
 
     return list(selected)
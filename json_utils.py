@@ -0,0 +1,45 @@
+"""
+JSON encoding and decoding helpers for TestGPT.
+
+Backed by orjson. Shared by the persistence layer, the engine and the
+Claude viewport parser, so they all encode and decode JSON the same way.
+"""
+
+import uuid
+from datetime import datetime
+from enum import Enum
+
+import orjson
+
+
+def _json_default(value):
+    """Serialize values the JSON encoders don't handle natively."""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, Enum):
+        return value.value
+    return str(value)
+
+
+def json_dumps(data, indent: bool = False) -> bytes:
+    """
+    Encode data as UTF-8 JSON bytes.
+
+    Datetimes, UUIDs and enums are handled (see _json_default), and
+    non-string dict keys are allowed.
+    """
+    option = orjson.OPT_NON_STR_KEYS
+    if indent:
+        option |= orjson.OPT_INDENT_2
+    return orjson.dumps(data, default=_json_default, option=option)
+
+
+def json_loads(data):
+    """
+    Parse a JSON document from bytes or str.
+
+    Raises a ValueError subclass (json.JSONDecodeError) on invalid JSON.
+    """
+    return orjson.loads(data)
@@ -11,13 +11,20 @@ This is the single entrypoint for running TestGPT.
 """
 
 import asyncio
+import logging
 import os
 import sys
+import time
+import traceback
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
+# Show the engine's step-by-step progress on the console
+logging.basicConfig(format="%(message)s", stream=sys.stdout)
+logging.getLogger("testgpt_engine").setLevel(logging.INFO)
+
 
 def print_banner():
     """Print TestGPT banner."""
@@ -142,19 +149,30 @@ async def start_slack_bot():
             return result
 
         except Exception as e:
-            import traceback
             error_details = traceback.format_exc()
             print(f" Error in run_testgpt_task: {error_details}")
             return f" Error: {str(e)}\n\nPlease try again or rephrase your request."
 
+    async def run_and_reply(user_message: str, user_id: str, channel, say):
+        """Run a TestGPT task, post the result, then let background work finish."""
+        result = await run_testgpt_task(user_message, user_id)
+
+        # Post result back to Slack
+        print(f" TestGPT completed. Posting results to Slack...")
+        say(text=result, channel=channel)
+
+        # MCP cleanup and the DB save run in the background; finish them before the loop closes.
+        # The engine is shared by every mention, each on its own thread and loop, so drain()
+        # only waits for the tasks this mention's loop started
+        if testgpt_engine is not None:
+            await testgpt_engine.drain()
+
     # Track processed events to prevent duplicates
     processed_events = set()
 
     @app.event("app_mention")
     def handle_mention(event, say):
         """Handle when the bot is mentioned in Slack."""
-        import time
-
         # Get event timestamp
         event_id = event.get("event_ts") or event.get("ts")
         event_ts = float(event_id) if event_id else time.time()
@@ -201,14 +219,9 @@ async def start_slack_bot():
 
         # Run TestGPT task
         try:
-            result = asyncio.run(run_testgpt_task(user_message, user_id))
-
-            # Post result back to Slack
-            print(f" TestGPT completed. Posting results to Slack...")
-            say(text=result, channel=channel)
+            asyncio.run(run_and_reply(user_message, user_id, channel, say))
 
         except Exception as e:
-            import traceback
             error_details = traceback.format_exc()
             print(f" Error in handle_mention: {error_details}")
             error_msg = f" Error running TestGPT: {str(e)}"
@@ -265,7 +278,6 @@ Mention me with a natural language test request.
         print(" Goodbye!")
     except Exception as e:
         print(f"\n Error: {e}")
-        import traceback
         traceback.print_exc()
 
 
@@ -6,6 +6,7 @@ and environment profiles according to the TestGPT specification.
 """
 
 from dataclasses import dataclass, field
+from functools import cached_property
 from typing import List, Dict, Optional, Literal
 from datetime import datetime
 from enum import Enum
@@ -105,6 +106,11 @@ class TestFlow:
     flow_name: str
     steps: List[TestStep]
 
+    @cached_property
+    def total_timeout_seconds(self) -> int:
+        """Sum of all step timeouts (computed once per flow)."""
+        return sum(step.timeout_seconds for step in self.steps)
+
 
 @dataclass
 class TestCheckpoint:
@@ -160,7 +166,7 @@ class MatrixCell:
     steps: List[TestStep]
 
 
-@dataclass
+@dataclass(slots=True)
 class TestPlan:
     """
     Complete test plan generated before execution.
@@ -185,7 +191,7 @@ class TestPlan:
 # EXECUTION RESULTS
 # ============================================================================
 
-@dataclass
+@dataclass(slots=True)
 class StepResult:
     """Result of executing a single test step."""
     step_number: int
@@ -228,7 +234,7 @@ class NetworkRequest:
     timestamp: datetime
 
 
-@dataclass
+@dataclass(slots=True)
 class CellResult:
     """
     Result of executing one matrix cell.
@@ -279,7 +285,7 @@ class FailuresByPriority:
     P2: List[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class RunArtifact:
     """
     Complete record of a test run execution.
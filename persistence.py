@@ -5,13 +5,24 @@ Stores and retrieves scenarios, test plans, and run artifacts.
 Simple JSON file-based storage for now (can be upgraded to DB later).
 """
 
-import json
+import heapq
 import os
+import tempfile
+import threading
+from contextlib import contextmanager
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 from pathlib import Path
 from models import ScenarioDefinition, RunArtifact, TestPlan
 from dataclasses import asdict
+from json_utils import json_dumps, json_loads
+
+# Advisory file locks, so processes sharing a storage dir (Slack bot, API)
+# don't lose each other's index updates. Not available on Windows.
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
 
 
 class PersistenceLayer:
@@ -41,6 +52,23 @@ class PersistenceLayer:
         self.runs_dir.mkdir(parents=True, exist_ok=True)
         self.plans_dir.mkdir(parents=True, exist_ok=True)
 
+        # Parsed scenario files keyed by path: (st_mtime_ns, scenario_dict)
+        self._scenario_cache: Dict[Path, Tuple[int, dict]] = {}
+
+        # Index of scenario_id -> {scenario_name, created_at, last_run_at},
+        # kept next to the scenarios so "most recent" lookups don't have to
+        # parse every scenario file. Cached against the mtimes of the index
+        # file and the scenarios directory, so scenarios added or removed by
+        # other processes are picked up.
+        self.index_file = self.storage_dir / "scenarios_index.json"
+        self.index_lock_file = self.storage_dir / "scenarios_index.lock"
+        self._index_cache: Optional[Tuple[Tuple[Optional[int], int], Dict[str, dict]]] = None
+        self._index_lock = threading.Lock()
+
+        # Most recently run scenario in the cached index, as (recency key,
+        # scenario_id); None when it has to be recomputed
+        self._most_recent: Optional[Tuple[str, str]] = None
+
     # ========================================================================
     # SCENARIO PERSISTENCE
     # ========================================================================
@@ -56,13 +84,10 @@ class PersistenceLayer:
             True if successful
         """
         try:
-            file_path = self.scenarios_dir / f"{scenario.scenario_id}.json"
-
             # Convert to dict with datetime serialization
             scenario_dict = self._serialize_dataclass(scenario)
 
-            with open(file_path, 'w') as f:
-                json.dump(scenario_dict, f, indent=2, default=str)
+            self._write_scenario(scenario_dict)
 
             print(f" Saved scenario: {scenario.scenario_id}")
             return True
@@ -87,8 +112,7 @@ class PersistenceLayer:
             if not file_path.exists():
                 return None
 
-            with open(file_path, 'r') as f:
-                scenario_dict = json.load(f)
+            scenario_dict = self._read_scenario_file(file_path)
 
             # Note: Full deserialization would require reconstructing dataclass
             # For now, return as dict (can be upgraded)
@@ -113,8 +137,7 @@ class PersistenceLayer:
 
         try:
             for file_path in self.scenarios_dir.glob("*.json"):
-                with open(file_path, 'r') as f:
-                    scenario_dict = json.load(f)
+                scenario_dict = self._read_scenario_file(file_path)
 
                 scenario_name = scenario_dict.get("scenario_name", "").lower()
 
@@ -141,8 +164,7 @@ class PersistenceLayer:
 
         try:
             for file_path in self.scenarios_dir.glob("*.json"):
-                with open(file_path, 'r') as f:
-                    scenario_dict = json.load(f)
+                scenario_dict = self._read_scenario_file(file_path)
 
                 target_url = scenario_dict.get("target_url", "").lower()
 
@@ -165,22 +187,136 @@ class PersistenceLayer:
 
         try:
             for file_path in self.scenarios_dir.glob("*.json"):
-                with open(file_path, 'r') as f:
-                    scenario_dict = json.load(f)
+                scenario_dict = self._read_scenario_file(file_path)
+
+                scenarios.append(self._scenario_summary(scenario_dict))
+
+        except Exception as e:
+            print(f" Error listing scenarios: {str(e)}")
+
+        return scenarios
+
+    def list_scenarios(self, limit: int) -> List[dict]:
+        """
+        List the most recently modified scenarios.
 
-                scenarios.append({
-                    "scenario_id": scenario_dict.get("scenario_id"),
-                    "scenario_name": scenario_dict.get("scenario_name"),
-                    "target_url": scenario_dict.get("target_url"),
-                    "created_at": scenario_dict.get("created_at"),
-                    "tags": scenario_dict.get("tags", [])
-                })
+        Only the newest `limit` scenario files are parsed, so this stays
+        cheap no matter how many scenarios are saved.
+
+        Args:
+            limit: Maximum number of scenarios to return
+
+        Returns:
+            Scenario summary dicts (as in list_all_scenarios), newest first
+        """
+        scenarios = []
+
+        try:
+            with os.scandir(self.scenarios_dir) as entries:
+                newest = heapq.nlargest(
+                    limit,
+                    (entry for entry in entries if entry.name.endswith(".json")),
+                    key=lambda entry: entry.stat().st_mtime_ns
+                )
+
+            for entry in newest:
+                scenario_dict = self._read_scenario_file(Path(entry.path))
+
+                scenarios.append(self._scenario_summary(scenario_dict))
 
         except Exception as e:
             print(f" Error listing scenarios: {str(e)}")
 
         return scenarios
 
+    def list_scenario_names(self, limit: int) -> List[str]:
+        """
+        List the names of the most recently modified scenarios.
+
+        Args:
+            limit: Maximum number of names to return
+
+        Returns:
+            Scenario names, newest first
+        """
+        return [scenario["scenario_name"] for scenario in self.list_scenarios(limit)]
+
+    def scenarios_fingerprint(self) -> int:
+        """
+        Fingerprint the saved scenario files.
+
+        Changes whenever a scenario file is added, removed, or rewritten,
+        so callers can cache anything derived from the scenario list.
+
+        Returns:
+            Hash of (file name, mtime_ns) pairs for all scenario files
+        """
+        with os.scandir(self.scenarios_dir) as entries:
+            return hash(tuple(sorted(
+                (entry.name, entry.stat().st_mtime_ns)
+                for entry in entries
+                if entry.name.endswith(".json")
+            )))
+
+    def get_scenarios_index(self) -> Dict[str, dict]:
+        """
+        Get the scenario index.
+
+        The index is rebuilt from the scenario files when it is missing or
+        unreadable, is kept up to date by every scenario write, and is
+        reconciled with the scenario files whenever they are added or
+        removed behind its back.
+
+        Returns:
+            Dict of scenario_id -> {scenario_name, created_at, last_run_at}.
+            Callers must not mutate it.
+        """
+        with self._index_locked():
+            return self._load_index()
+
+    def get_most_recent_scenario_id(self) -> Optional[str]:
+        """
+        Get the ID of the most recently run scenario.
+
+        Recency is last_run_at, falling back to created_at for scenarios
+        that have never run. The answer is maintained as scenarios are
+        written, so repeated lookups don't rescan the index.
+
+        Returns:
+            Scenario ID, or None if there are no scenarios
+        """
+        with self._index_locked():
+            index = self._load_index()
+
+            if self._most_recent is None and index:
+                self._most_recent = max(
+                    (self._recency_key(entry), scenario_id)
+                    for scenario_id, entry in index.items()
+                )
+
+            return self._most_recent[1] if self._most_recent else None
+
+    def load_most_recent_scenario(self) -> Optional[dict]:
+        """
+        Load the most recently run scenario.
+
+        If the index points at a scenario file that is gone or unreadable,
+        that entry is dropped and the next most recent scenario is tried.
+
+        Returns:
+            Scenario dict, or None if there are no loadable scenarios
+        """
+        while True:
+            scenario_id = self.get_most_recent_scenario_id()
+            if scenario_id is None:
+                return None
+
+            scenario_dict = self.load_scenario(scenario_id)
+            if scenario_dict is not None:
+                return scenario_dict
+
+            self._drop_index_entry(scenario_id)
+
     # ========================================================================
     # RUN ARTIFACT PERSISTENCE
     # ========================================================================
@@ -201,8 +337,7 @@ class PersistenceLayer:
             # Convert to dict with datetime serialization
             artifact_dict = self._serialize_dataclass(run_artifact)
 
-            with open(file_path, 'w') as f:
-                json.dump(artifact_dict, f, indent=2, default=str)
+            self._write_json(file_path, artifact_dict, durable=True)
 
             print(f" Saved run artifact: {run_artifact.run_id}")
             return True
@@ -211,6 +346,42 @@ class PersistenceLayer:
             print(f" Error saving run artifact: {str(e)}")
             return False
 
+    def save_run_bundle(
+        self,
+        scenario: ScenarioDefinition,
+        run_artifact: RunArtifact,
+        last_run_at: datetime
+    ) -> bool:
+        """
+        Save a run artifact together with its scenario's last_run_at update.
+
+        The scenario is serialized from the in-memory definition, so the
+        saved scenario file does not have to be read back and re-parsed
+        the way update_scenario_last_run does.
+
+        Args:
+            scenario: ScenarioDefinition the run belongs to
+            run_artifact: RunArtifact to save
+            last_run_at: Timestamp of the run
+
+        Returns:
+            True if both records were written
+        """
+        try:
+            scenario_dict = self._serialize_dataclass(scenario)
+            scenario_dict["last_run_at"] = last_run_at.isoformat()
+            artifact_dict = self._serialize_dataclass(run_artifact)
+
+            self._write_json(self.runs_dir / f"{run_artifact.run_id}.json", artifact_dict, durable=True)
+            self._write_scenario(scenario_dict)
+
+            print(f" Saved run artifact: {run_artifact.run_id}")
+            return True
+
+        except Exception as e:
+            print(f" Error saving run bundle: {str(e)}")
+            return False
+
     def load_run_artifact(self, run_id: str) -> Optional[dict]:
         """
         Load a run artifact by ID.
@@ -227,8 +398,8 @@ class PersistenceLayer:
             if not file_path.exists():
                 return None
 
-            with open(file_path, 'r') as f:
-                artifact_dict = json.load(f)
+            with open(file_path, 'rb') as f:
+                artifact_dict = json_loads(f.read())
 
             return artifact_dict
 
@@ -250,8 +421,8 @@ class PersistenceLayer:
             matching_runs = []
 
             for file_path in self.runs_dir.glob("*.json"):
-                with open(file_path, 'r') as f:
-                    artifact_dict = json.load(f)
+                with open(file_path, 'rb') as f:
+                    artifact_dict = json_loads(f.read())
 
                 if artifact_dict.get("scenario_id") == scenario_id:
                     matching_runs.append(artifact_dict)
@@ -275,6 +446,229 @@ class PersistenceLayer:
     # HELPER METHODS
     # ========================================================================
 
+    def _write_json(self, file_path: Path, data, durable: bool = False) -> None:
+        """
+        Atomically write data as JSON to file_path.
+
+        The document is serialized in memory and written to a uniquely
+        named temp file in the same directory, which is then renamed over
+        file_path. A crash or a concurrent writer leaves either the old file
+        or one complete new one, never a torn mix. durable=True also fsyncs
+        the temp file and then the directory, so the write returns only once
+        the new file and its name are on disk.
+        """
+        payload = json_dumps(data, indent=True)
+
+        fd, tmp_name = tempfile.mkstemp(
+            dir=file_path.parent, prefix=file_path.name + ".", suffix=".tmp"
+        )
+        try:
+            try:
+                # mkstemp creates the file owner-only; match a plain open()
+                os.fchmod(fd, 0o644)
+                view = memoryview(payload)
+                while view:
+                    view = view[os.write(fd, view):]
+                if durable:
+                    os.fsync(fd)
+            finally:
+                os.close(fd)
+            os.replace(tmp_name, file_path)
+        except BaseException:
+            try:
+                os.unlink(tmp_name)
+            except FileNotFoundError:
+                pass
+            raise
+
+        if durable:
+            self._fsync_dir(file_path.parent)
+
+        self._scenario_cache.pop(file_path, None)
+
+    @staticmethod
+    def _fsync_dir(dir_path: Path) -> None:
+        """Flush a directory entry change (e.g. a rename) to disk, where supported."""
+        try:
+            dir_fd = os.open(dir_path, os.O_RDONLY)
+        except OSError:
+            # Directories can't be opened on some platforms (Windows)
+            return
+        try:
+            os.fsync(dir_fd)
+        except OSError:
+            pass
+        finally:
+            os.close(dir_fd)
+
+    def _write_scenario(self, scenario_dict: dict) -> None:
+        """Atomically write a scenario file and record it in the scenario index."""
+        scenario_id = scenario_dict["scenario_id"]
+        self._write_json(self.scenarios_dir / f"{scenario_id}.json", scenario_dict)
+
+        with self._index_locked():
+            index = dict(self._load_index())
+            entry = index[scenario_id] = self._index_entry(scenario_dict)
+            self._write_json(self.index_file, index, durable=True)
+
+            # Keep the most recent scenario current without a rescan: a write
+            # that is at least as recent takes over, and if the current most
+            # recent scenario moved back in time it has to be recomputed
+            most_recent = self._most_recent
+            key = self._recency_key(entry)
+            self._set_index_cache(index)
+            if most_recent is not None:
+                if (key, scenario_id) >= most_recent:
+                    self._most_recent = (key, scenario_id)
+                elif most_recent[1] != scenario_id:
+                    self._most_recent = most_recent
+
+    def _drop_index_entry(self, scenario_id: str) -> None:
+        """Remove a scenario whose file can't be loaded from the scenario index."""
+        with self._index_locked():
+            index = dict(self._load_index())
+            if index.pop(scenario_id, None) is None:
+                return
+
+            self._write_json(self.index_file, index, durable=True)
+            self._set_index_cache(index)
+
+    @contextmanager
+    def _index_locked(self):
+        """
+        Hold the scenario index lock, across threads and (where fcntl is
+        available) across processes sharing the storage dir.
+        """
+        with self._index_lock:
+            if fcntl is None:
+                yield
+                return
+
+            with open(self.index_lock_file, 'a') as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _load_index(self) -> Dict[str, dict]:
+        """
+        Read the scenario index, reconciled with the scenario files.
+        Caller holds the index lock.
+
+        A missing or unreadable index is rebuilt from the scenario files,
+        and an index that no longer matches them (scenarios saved by
+        another process, deleted files) is brought back in line.
+        """
+        cache_key = self._index_cache_key()
+        if self._index_cache and self._index_cache[0] == cache_key:
+            return self._index_cache[1]
+
+        try:
+            with open(self.index_file, 'rb') as f:
+                index = json_loads(f.read())
+        except (OSError, ValueError):
+            # Missing, or corrupted (e.g. by a crash mid-write)
+            index = None
+
+        if not isinstance(index, dict):
+            index = None
+
+        with os.scandir(self.scenarios_dir) as entries:
+            scenario_ids = {
+                entry.name[:-len(".json")]
+                for entry in entries
+                if entry.name.endswith(".json")
+            }
+
+        if index is None or index.keys() != scenario_ids:
+            index = self._reconcile_index(index or {}, scenario_ids)
+            self._write_json(self.index_file, index, durable=True)
+            cache_key = None
+
+        self._set_index_cache(index, cache_key)
+        return index
+
+    def _reconcile_index(self, index: Dict[str, dict], scenario_ids: set) -> Dict[str, dict]:
+        """Match the index to the scenario files, skipping any that can't be read."""
+        reconciled = {
+            scenario_id: entry
+            for scenario_id, entry in index.items()
+            if scenario_id in scenario_ids
+        }
+
+        for scenario_id in scenario_ids - reconciled.keys():
+            try:
+                scenario_dict = self._read_scenario_file(self.scenarios_dir / f"{scenario_id}.json")
+            except (OSError, ValueError):
+                continue
+            reconciled[scenario_id] = self._index_entry(scenario_dict)
+
+        return reconciled
+
+    def _index_cache_key(self) -> Tuple[Optional[int], int]:
+        """Mtimes of the index file (None if missing) and the scenarios dir."""
+        try:
+            index_mtime_ns = self.index_file.stat().st_mtime_ns
+        except FileNotFoundError:
+            index_mtime_ns = None
+        return index_mtime_ns, self.scenarios_dir.stat().st_mtime_ns
+
+    def _set_index_cache(
+        self,
+        index: Dict[str, dict],
+        cache_key: Optional[Tuple[Optional[int], int]] = None
+    ) -> None:
+        """Cache a freshly read or written index. Caller holds the index lock."""
+        if cache_key is None:
+            cache_key = self._index_cache_key()
+        self._index_cache = (cache_key, index)
+        self._most_recent = None
+
+    def _recency_key(self, entry: dict) -> str:
+        """Sort key ordering index entries by how recently they ran."""
+        return entry.get("last_run_at") or entry.get("created_at") or ""
+
+    def _index_entry(self, scenario_dict: dict) -> dict:
+        """Build a scenario's entry in the scenario index."""
+        return {
+            "scenario_name": scenario_dict.get("scenario_name"),
+            "created_at": scenario_dict.get("created_at"),
+            "last_run_at": scenario_dict.get("last_run_at")
+        }
+
+    def _read_scenario_file(self, file_path: Path) -> dict:
+        """
+        Read and parse a scenario file.
+
+        Parsed dicts are cached by path and reused for as long as the
+        file's mtime is unchanged, so listing and re-loading the same
+        scenarios doesn't re-parse them. Callers must not mutate the
+        returned dict.
+        """
+        mtime_ns = file_path.stat().st_mtime_ns
+        cached = self._scenario_cache.get(file_path)
+
+        if cached and cached[0] == mtime_ns:
+            return cached[1]
+
+        with open(file_path, 'rb') as f:
+            scenario_dict = json_loads(f.read())
+
+        self._scenario_cache[file_path] = (mtime_ns, scenario_dict)
+        return scenario_dict
+
+    def _scenario_summary(self, scenario_dict: dict) -> dict:
+        """Build the summary dict returned by the scenario listings."""
+        return {
+            "scenario_id": scenario_dict.get("scenario_id"),
+            "scenario_name": scenario_dict.get("scenario_name"),
+            "target_url": scenario_dict.get("target_url"),
+            "created_at": scenario_dict.get("created_at"),
+            "last_run_at": scenario_dict.get("last_run_at"),
+            "tags": scenario_dict.get("tags", [])
+        }
+
     def _serialize_dataclass(self, obj):
         """
         Recursively serialize a dataclass to dict.
@@ -322,11 +716,11 @@ class PersistenceLayer:
             if not scenario_dict:
                 return False
 
+            # Copy so the cached parse isn't mutated if the write fails
+            scenario_dict = dict(scenario_dict)
             scenario_dict["last_run_at"] = run_timestamp.isoformat()
 
-            file_path = self.scenarios_dir / f"{scenario_id}.json"
-            with open(file_path, 'w') as f:
-                json.dump(scenario_dict, f, indent=2)
+            self._write_scenario(scenario_dict)
 
             return True
 
@@ -6,7 +6,8 @@ Parses natural language Slack messages into structured test requirements.
 
 import re
 import os
-from typing import List, Optional
+from functools import lru_cache
+from typing import List, Optional, Tuple
 from models import ParsedSlackRequest
 from config import select_viewports_for_keywords, select_browsers_for_keywords, select_networks_for_keywords
 
@@ -511,29 +512,7 @@ class SlackRequestParser:
 
         Format: "{Target Site} - {Primary Flow} - {Key Check}"
         """
-        # Extract domain from URL
-        url = parsed.target_urls[0]
-        domain = url.replace("https://", "").replace("http://", "").split("/")[0]
-        domain_clean = domain.replace("www.", "").title()
-
-        # Get primary flow
-        primary_flow = parsed.flows[0] if parsed.flows else "General"
-        flow_title = primary_flow.replace("_", " ").title()
-
-        # Add environment context if matrix
-        if self.should_create_matrix(parsed):
-            if len(parsed.required_browsers) > 1:
-                env_context = "Cross-Browser Test"
-            elif len(parsed.required_viewports) > 1:
-                env_context = "Responsive Test"
-            elif len(parsed.required_networks) > 1:
-                env_context = "Network Conditions Test"
-            else:
-                env_context = "Multi-Environment Test"
-        else:
-            env_context = "Standard Test"
-
-        return f"{domain_clean} - {flow_title} - {env_context}"
+        return self.get_scenario_identity(parsed)[1]
 
     def get_scenario_id(self, parsed: ParsedSlackRequest) -> str:
         """
@@ -541,17 +520,70 @@ class SlackRequestParser:
 
         Format: scenario-{domain}-{flow}-{hash}
         """
-        url = parsed.target_urls[0]
-        domain = url.replace("https://", "").replace("http://", "").replace("www.", "").split("/")[0]
-        domain_slug = domain.replace(".", "-")
+        return self.get_scenario_identity(parsed)[0]
+
+    def get_scenario_identity(self, parsed: ParsedSlackRequest) -> Tuple[str, str]:
+        """
+        Generate the scenario ID and name together.
+
+        Both are built by a memoized helper keyed on the few request fields
+        they depend on, so repeated requests for the same scenario skip the
+        string work.
+
+        Returns:
+            (scenario_id, scenario_name)
+        """
+        return _scenario_identity(
+            parsed.target_urls[0],
+            parsed.flows[0] if parsed.flows else None,
+            len(parsed.required_viewports),
+            len(parsed.required_browsers),
+            len(parsed.required_networks),
+            self.should_create_matrix(parsed)
+        )
 
-        primary_flow = parsed.flows[0] if parsed.flows else "general"
-        flow_slug = primary_flow.replace(" ", "-").lower()
 
-        # Create a simple hash based on environments
-        env_hash = f"{len(parsed.required_viewports)}{len(parsed.required_browsers)}{len(parsed.required_networks)}"
+@lru_cache(maxsize=1024)
+def _scenario_identity(
+    url: str,
+    primary_flow: Optional[str],
+    viewport_count: int,
+    browser_count: int,
+    network_count: int,
+    is_matrix: bool
+) -> Tuple[str, str]:
+    """Build (scenario_id, scenario_name) for SlackRequestParser.get_scenario_identity."""
+    # Scenario ID: scenario-{domain}-{flow}-{hash}
+    domain = url.replace("https://", "").replace("http://", "").replace("www.", "").split("/")[0]
+    domain_slug = domain.replace(".", "-")
+
+    flow_slug = (primary_flow or "general").replace(" ", "-").lower()
+
+    # Create a simple hash based on environments
+    env_hash = f"{viewport_count}{browser_count}{network_count}"
+
+    scenario_id = f"scenario-{domain_slug}-{flow_slug}-{env_hash}"
+
+    # Scenario name: "{Target Site} - {Primary Flow} - {Key Check}"
+    domain = url.replace("https://", "").replace("http://", "").split("/")[0]
+    domain_clean = domain.replace("www.", "").title()
+
+    flow_title = (primary_flow or "General").replace("_", " ").title()
+
+    # Add environment context if matrix
+    if is_matrix:
+        if browser_count > 1:
+            env_context = "Cross-Browser Test"
+        elif viewport_count > 1:
+            env_context = "Responsive Test"
+        elif network_count > 1:
+            env_context = "Network Conditions Test"
+        else:
+            env_context = "Multi-Environment Test"
+    else:
+        env_context = "Standard Test"
 
-        return f"scenario-{domain_slug}-{flow_slug}-{env_hash}"
+    return scenario_id, f"{domain_clean} - {flow_title} - {env_context}"
 
 
 # ============================================================================
@@ -5,6 +5,7 @@ Aggregates test results and formats Slack summaries.
 Implements result packaging from specification Section 5 and TODO 6.
 """
 
+from datetime import datetime
 from typing import List, Dict
 from collections import defaultdict
 from models import (
@@ -70,7 +71,6 @@ class ResultFormatter:
             started_at = earliest_start
             completed_at = latest_end
         else:
-            from datetime import datetime
             started_at = completed_at = datetime.now()
             duration_seconds = 0
 
@@ -6,11 +6,17 @@ This tests the full flow: Slack message → TestGPT Engine → Coverage → Slac
 """
 
 import asyncio
+import logging
 import sys
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+# Show the engine's step-by-step progress on the console
+logging.basicConfig(format="%(message)s", stream=sys.stdout)
+logging.getLogger("testgpt_engine").setLevel(logging.INFO)
+
+
 async def test_coverage_integration():
     """Test the full coverage integration flow."""
 
@@ -163,6 +169,9 @@ async def test_coverage_integration():
         traceback.print_exc()
         return False
 
+    # Finish the engine's background work (MCP cleanup, DB saves) before the loop closes
+    await engine.drain()
+
     # All tests passed
     print("\n" + "="*70)
     print(" ALL INTEGRATION TESTS PASSED")
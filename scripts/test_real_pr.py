@@ -6,11 +6,16 @@ Test PR testing with a real GitHub PR.
 import sys
 import os
 import asyncio
+import logging
 
 # Load GitHub token from .env file
 from dotenv import load_dotenv
 load_dotenv()
 
+# Show the engine's step-by-step progress on the console
+logging.basicConfig(format="%(message)s", stream=sys.stdout)
+logging.getLogger("testgpt_engine").setLevel(logging.INFO)
+
 # Add paths
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
@@ -70,6 +75,9 @@ async def test_real_pr():
         import traceback
         traceback.print_exc()
         return False
+    finally:
+        # MCP cleanup and the DB save run in the background; finish them before the loop closes
+        await engine.drain()
 
     return True
 
@@ -6,8 +6,14 @@ Shows how requests are parsed, plans are built, and results are formatted.
 """
 
 import asyncio
+import logging
+import sys
 from testgpt_engine import TestGPTEngine
 
+# Show the engine's step-by-step progress on the console
+logging.basicConfig(format="%(message)s", stream=sys.stdout)
+logging.getLogger("testgpt_engine").setLevel(logging.INFO)
+
 
 async def test_pointblank_safari_responsive():
     """
@@ -27,6 +33,9 @@ async def test_pointblank_safari_responsive():
     # Process request
     result = await engine.process_test_request(test_message, user_id="test-user")
 
+    # MCP cleanup and the DB save run in the background; finish them before the loop closes
+    await engine.drain()
+
     print("\n" + "=" * 80)
     print("SLACK OUTPUT:")
     print("=" * 80)
@@ -46,6 +55,9 @@ async def test_simple_landing_page():
 
     result = await engine.process_test_request(test_message, user_id="test-user")
 
+    # MCP cleanup and the DB save run in the background; finish them before the loop closes
+    await engine.drain()
+
     print("\n" + "=" * 80)
     print("SLACK OUTPUT:")
     print("=" * 80)
@@ -65,6 +77,9 @@ async def test_cross_browser():
 
     result = await engine.process_test_request(test_message, user_id="test-user")
 
+    # MCP cleanup and the DB save run in the background; finish them before the loop closes
+    await engine.drain()
+
     print("\n" + "=" * 80)
     print("SLACK OUTPUT:")
     print("=" * 80)
@@ -18,7 +18,9 @@ When mentioned in Slack, the bot:
 from slack_bolt import App
 from slack_bolt.adapter.socket_mode import SocketModeHandler
 import asyncio
+import logging
 import os
+import sys
 from dotenv import load_dotenv
 from agno.tools.mcp import MCPTools
 
@@ -27,6 +29,10 @@ from testgpt_engine import TestGPTEngine
 
 load_dotenv()
 
+# Show the engine's step-by-step progress on the console
+logging.basicConfig(format="%(message)s", stream=sys.stdout)
+logging.getLogger("testgpt_engine").setLevel(logging.INFO)
+
 # Initialize Slack app
 app = App(token=os.environ.get("SLACK_BOT_TOKEN"))
 
@@ -93,6 +99,21 @@ async def run_testgpt_task(user_message: str, user_id: str) -> str:
         return f" Error: {str(e)}\n\nPlease try again or rephrase your request."
 
 
+async def run_and_reply(user_message: str, user_id: str, channel, say):
+    """Run a TestGPT task, post the result, then let background work finish."""
+    result = await run_testgpt_task(user_message, user_id)
+
+    # Post result back to Slack
+    print(f" TestGPT completed. Posting results to Slack...")
+    say(text=result, channel=channel)
+
+    # MCP cleanup and the DB save run in the background; finish them before the loop closes.
+    # The engine is shared by every mention, each on its own thread and loop, so drain()
+    # only waits for the tasks this mention's loop started
+    if testgpt_engine is not None:
+        await testgpt_engine.drain()
+
+
 @app.event("app_mention")
 def handle_mention(event, say):
     """Handle when the bot is mentioned in Slack."""
@@ -118,11 +139,7 @@ def handle_mention(event, say):
 
     # Run TestGPT task
     try:
-        result = asyncio.run(run_testgpt_task(user_message, user_id))
-
-        # Post result back to Slack
-        print(f" TestGPT completed. Posting results to Slack...")
-        say(text=result, channel=channel)
+        asyncio.run(run_and_reply(user_message, user_id, channel, say))
 
     except Exception as e:
         error_msg = f" Error running TestGPT: {str(e)}"
@@ -6,8 +6,10 @@ Implements execution contracts from specification Section 4.
 """
 
 import asyncio
+import traceback
 from datetime import datetime
-from typing import List, Optional
+from pathlib import Path
+from typing import FrozenSet, List, Optional
 from io import StringIO
 from contextlib import contextmanager
 from models import (
@@ -22,6 +24,18 @@ import sys
 from mcp_manager import get_mcp_manager
 
 
+# Viewports treated as "standard" when prioritizing failures
+_STANDARD_VIEWPORTS: FrozenSet[str] = frozenset({"desktop-standard", "iphone-13-pro", "ipad-air"})
+
+# (is_normal_network, is_standard_viewport) -> priority
+_PRIORITY_TABLE = {
+    (True, True): FailurePriority.P0,
+    (True, False): FailurePriority.P2,
+    (False, True): FailurePriority.P1,
+    (False, False): FailurePriority.P1,
+}
+
+
 class TestExecutor:
     """
     Executes test plans using Playwright MCP.
@@ -203,8 +217,6 @@ class TestExecutor:
         Returns:
             dict with test results from backend testing agent
         """
-        from pathlib import Path
-
         print(f"\n Executing backend API test")
         if repo_url:
             print(f"   Repository: {repo_url}")
@@ -275,7 +287,6 @@ Be thorough and report clear results.""",
             }
 
         except Exception as e:
-            import traceback
             error_traceback = traceback.format_exc()
 
             completed_at = datetime.now()
@@ -565,7 +576,6 @@ Begin execution now. Take full control."""
 
         except Exception as e:
             # Log the full error details
-            import traceback
             error_traceback = traceback.format_exc()
 
             self._log(f"\n AGENT EXECUTION ERROR:")
@@ -999,14 +1009,9 @@ Expected outcomes:
         P2: Edge viewports only (layout edge case)
         """
         is_normal_network = cell.network.name == "normal"
-        is_standard_viewport = cell.viewport.name in ["desktop-standard", "iphone-13-pro", "ipad-air"]
+        is_standard_viewport = cell.viewport.name in _STANDARD_VIEWPORTS
 
-        if is_normal_network and is_standard_viewport:
-            return FailurePriority.P0
-        elif not is_normal_network:
-            return FailurePriority.P1
-        else:
-            return FailurePriority.P2
+        return _PRIORITY_TABLE[(is_normal_network, is_standard_viewport)]
 
     def _create_error_result(self, cell: MatrixCell, error_message: str) -> CellResult:
         """Create a CellResult for catastrophic execution error."""
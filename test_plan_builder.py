@@ -7,8 +7,12 @@ Implements matrix expansion logic from specification TODO 5.
 
 import uuid
 import re
+import string
 from datetime import datetime
-from typing import List
+from functools import cache, lru_cache
+from itertools import product
+from typing import List, Tuple
+from urllib.parse import urlsplit
 from models import (
     TestPlan, TestFlow, TestStep, MatrixCell, EnvironmentMatrix,
     ActionType, ParsedSlackRequest, ScenarioDefinition
@@ -17,6 +21,71 @@ from config import get_viewport, get_browser, get_network
 from agent_instructions import get_pointblank_landing_flow, get_pointblank_pricing_flow, get_pointblank_signup_flow
 
 
+# Lowercases ASCII letters and maps spaces to dashes in a single pass
+_SLUG_TABLE = str.maketrans({**{c: c.lower() for c in string.ascii_uppercase}, " ": "-"})
+
+# Action value -> ActionType, bypassing Enum value lookup per step
+_ACTION_CACHE = {member.value: member for member in ActionType}
+
+# Browser profiles that earn the "safari" tag
+_SAFARI_BROWSERS = frozenset({"webkit-ios", "webkit-desktop"})
+
+# Generic flow name -> (selector, expected outcome) for its visibility check
+_FLOW_SPECS = {
+    "login": (
+        "input[type='email'], input[name='username']",
+        "Login form is visible"
+    ),
+    "checkout": (
+        "button:has-text('Checkout'), button:has-text('Buy'), button:has-text('Purchase')",
+        "Checkout button is visible"
+    ),
+    "search": (
+        "input[type='search'], input[placeholder*='Search']",
+        "Search input is visible"
+    ),
+}
+
+# Generic: check for key interactive elements
+_DEFAULT_FLOW_SPEC = (
+    "button, a.btn, a.button, [class*='cta']",
+    "Primary interactive element is visible"
+)
+
+
+@lru_cache(maxsize=256)
+def _domain_of(url: str) -> str:
+    """Extract the domain from a URL, tolerating scheme-less input."""
+    return urlsplit(url).netloc or url.split("/", 1)[0]
+
+
+# pointblank.club template flows, in the order they are included in a plan
+_PB_FLOW_SOURCES = {
+    "landing": get_pointblank_landing_flow,
+    "pricing": get_pointblank_pricing_flow,
+    "signup": get_pointblank_signup_flow,
+}
+
+
+@cache
+def _pb_flow_steps(name: str) -> Tuple[str, Tuple[TestStep, ...]]:
+    """Convert a pointblank.club template flow once per process, as (flow name, steps)."""
+    flow = TestPlanBuilder._dict_to_flow(_PB_FLOW_SOURCES[name]())
+    return flow.flow_name, tuple(flow.steps)
+
+
+def _pb_flow(name: str) -> TestFlow:
+    """
+    Build a pointblank.club template flow from its cached conversion.
+
+    Each call returns a new TestFlow with its own steps list, so callers
+    may add or remove steps. The TestStep objects themselves are shared
+    between plans and must not be modified.
+    """
+    flow_name, steps = _pb_flow_steps(name)
+    return TestFlow(flow_name=flow_name, steps=list(steps))
+
+
 class TestPlanBuilder:
     """
     Builds complete test plans with matrix expansion.
@@ -49,9 +118,10 @@ class TestPlanBuilder:
         test_plan_id = f"plan-{uuid.uuid4().hex[:12]}"
         created_at = datetime.now()
         target_url = parsed_request.target_urls[0]
+        is_pointblank = "pointblank.club" in target_url
 
         # Build flows
-        flows = self._build_flows(parsed_request)
+        flows = self._build_flows(parsed_request, target_url, is_pointblank)
 
         # Build environment matrix
         env_matrix = EnvironmentMatrix(
@@ -65,7 +135,7 @@ class TestPlanBuilder:
 
         # Calculate estimates
         total_cells = len(matrix_cells)
-        estimated_duration_minutes = self._estimate_duration(matrix_cells)
+        estimated_duration_minutes = self._estimate_duration(flows, total_cells)
 
         return TestPlan(
             test_plan_id=test_plan_id,
@@ -79,11 +149,16 @@ class TestPlanBuilder:
             matrix_cells=matrix_cells,
             total_cells_to_execute=total_cells,
             estimated_duration_minutes=estimated_duration_minutes,
-            tags=self._generate_tags(parsed_request),
+            tags=self._generate_tags(parsed_request, target_url, is_pointblank),
             user_request=parsed_request.raw_message
         )
 
-    def _build_flows(self, parsed_request: ParsedSlackRequest) -> List[TestFlow]:
+    def _build_flows(
+        self,
+        parsed_request: ParsedSlackRequest,
+        target_url: str,
+        is_pointblank: bool
+    ) -> List[TestFlow]:
         """
         Build test flows based on parsed request.
 
@@ -91,28 +166,15 @@ class TestPlanBuilder:
         or generates flows based on user requirements.
         """
         flows = []
-        target_url = parsed_request.target_urls[0]
 
         # Special handling for pointblank.club
-        if "pointblank.club" in target_url:
-            flows_to_include = []
-
-            if "landing" in parsed_request.flows:
-                landing_flow_dict = get_pointblank_landing_flow()
-                flows_to_include.append(self._dict_to_flow(landing_flow_dict))
-
-            if "pricing" in parsed_request.flows:
-                pricing_flow_dict = get_pointblank_pricing_flow()
-                flows_to_include.append(self._dict_to_flow(pricing_flow_dict))
-
-            if "signup" in parsed_request.flows:
-                signup_flow_dict = get_pointblank_signup_flow()
-                flows_to_include.append(self._dict_to_flow(signup_flow_dict))
+        if is_pointblank:
+            wanted = set(parsed_request.flows)
+            flows_to_include = [_pb_flow(name) for name in _PB_FLOW_SOURCES if name in wanted]
 
             # If no specific flows, include landing by default
             if not flows_to_include:
-                landing_flow_dict = get_pointblank_landing_flow()
-                flows_to_include.append(self._dict_to_flow(landing_flow_dict))
+                flows_to_include.append(_pb_flow("landing"))
 
             return flows_to_include
 
@@ -127,13 +189,14 @@ class TestPlanBuilder:
 
         return flows
 
-    def _dict_to_flow(self, flow_dict: dict) -> TestFlow:
+    @staticmethod
+    def _dict_to_flow(flow_dict: dict) -> TestFlow:
         """Convert flow dictionary to TestFlow object."""
         steps = []
         for step_dict in flow_dict["steps"]:
             step = TestStep(
                 step_number=step_dict["step_number"],
-                action=ActionType(step_dict["action"]),
+                action=_ACTION_CACHE[step_dict["action"]],
                 target=step_dict["target"],
                 expected_outcome=step_dict["expected"],
                 timeout_seconds=step_dict["timeout_seconds"]
@@ -175,47 +238,16 @@ class TestPlanBuilder:
         ))
         step_num += 1
 
-        # Add flow-specific steps
-        if flow_name == "login":
-            steps.append(TestStep(
-                step_number=step_num,
-                action=ActionType.ASSERT_VISIBLE,
-                target="input[type='email'], input[name='username']",
-                expected_outcome="Login form is visible",
-                timeout_seconds=3
-            ))
-            step_num += 1
-
-        elif flow_name == "checkout":
-            steps.append(TestStep(
-                step_number=step_num,
-                action=ActionType.ASSERT_VISIBLE,
-                target="button:has-text('Checkout'), button:has-text('Buy'), button:has-text('Purchase')",
-                expected_outcome="Checkout button is visible",
-                timeout_seconds=3
-            ))
-            step_num += 1
-
-        elif flow_name == "search":
-            steps.append(TestStep(
-                step_number=step_num,
-                action=ActionType.ASSERT_VISIBLE,
-                target="input[type='search'], input[placeholder*='Search']",
-                expected_outcome="Search input is visible",
-                timeout_seconds=3
-            ))
-            step_num += 1
-
-        else:
-            # Generic: check for key interactive elements
-            steps.append(TestStep(
-                step_number=step_num,
-                action=ActionType.ASSERT_VISIBLE,
-                target="button, a.btn, a.button, [class*='cta']",
-                expected_outcome="Primary interactive element is visible",
-                timeout_seconds=3
-            ))
-            step_num += 1
+        # Add flow-specific step
+        selector, expected = _FLOW_SPECS.get(flow_name, _DEFAULT_FLOW_SPEC)
+        steps.append(TestStep(
+            step_number=step_num,
+            action=ActionType.ASSERT_VISIBLE,
+            target=selector,
+            expected_outcome=expected,
+            timeout_seconds=3
+        ))
+        step_num += 1
 
         # Screenshot for evidence
         steps.append(TestStep(
@@ -274,52 +306,43 @@ class TestPlanBuilder:
         Each cell represents one test run in a specific environment.
         Cell ID format: {flow_slug}_{viewport}_{browser}_{network}_{timestamp}
         """
-        matrix_cells = []
         timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
-
-        for flow in flows:
-            flow_slug = flow.flow_name.lower().replace(" ", "-")[:20]
-
-            for viewport_name in env_matrix.viewports:
-                viewport = get_viewport(viewport_name)
-
-                for browser_name in env_matrix.browsers:
-                    browser = get_browser(browser_name)
-
-                    for network_name in env_matrix.networks:
-                        network = get_network(network_name)
-
-                        cell_id = f"{flow_slug}_{viewport_name}_{browser_name}_{network_name}_{timestamp}"
-
-                        cell = MatrixCell(
-                            cell_id=cell_id,
-                            viewport=viewport,
-                            browser=browser,
-                            network=network,
-                            steps=flow.steps
-                        )
-
-                        matrix_cells.append(cell)
+        suffix = f"_{timestamp}"
+
+        # Resolve each profile and slug once, not once per enclosing loop
+        slugged_flows = [(flow.flow_name.translate(_SLUG_TABLE)[:20], flow) for flow in flows]
+        viewports = [(name, get_viewport(name)) for name in env_matrix.viewports]
+        browsers = [(name, get_browser(name)) for name in env_matrix.browsers]
+        networks = [(name, get_network(name)) for name in env_matrix.networks]
+
+        matrix_cells = [
+            MatrixCell(
+                cell_id="_".join((flow_slug, viewport_name, browser_name, network_name)) + suffix,
+                viewport=viewport,
+                browser=browser,
+                network=network,
+                steps=flow.steps
+            )
+            for (flow_slug, flow), (viewport_name, viewport), (browser_name, browser), (network_name, network)
+            in product(slugged_flows, viewports, browsers, networks)
+        ]
 
         return matrix_cells
 
-    def _estimate_duration(self, matrix_cells: List[MatrixCell]) -> int:
+    def _estimate_duration(self, flows: List[TestFlow], total_cells: int) -> int:
         """
         Estimate total test duration in minutes.
 
         Assumes parallel execution with max 4 concurrent cells.
         """
-        if not matrix_cells:
+        if not flows or not total_cells:
             return 1
 
-        # Calculate total time for one cell (sum of all step timeouts + buffer)
-        sample_cell = matrix_cells[0]
-        total_step_timeout = sum(step.timeout_seconds for step in sample_cell.steps)
-        per_cell_time_seconds = total_step_timeout + 10  # 10s buffer
+        # Time for one cell: step timeouts of the first flow + buffer
+        per_cell_time_seconds = flows[0].total_timeout_seconds + 10  # 10s buffer
 
         # Assume max 4 parallel executions
         max_parallel = 4
-        total_cells = len(matrix_cells)
 
         # Calculate serial batches
         batches = (total_cells + max_parallel - 1) // max_parallel
@@ -330,17 +353,15 @@ class TestPlanBuilder:
 
         return total_time_minutes
 
-    def _generate_tags(self, parsed_request: ParsedSlackRequest) -> List[str]:
+    def _generate_tags(
+        self,
+        parsed_request: ParsedSlackRequest,
+        target_url: str,
+        is_pointblank: bool
+    ) -> List[str]:
         """Generate tags for categorizing the test plan."""
-        tags = []
-
-        # Add domain tag
-        target_url = parsed_request.target_urls[0]
-        domain = target_url.replace("https://", "").replace("http://", "").split("/")[0]
-        tags.append(domain)
-
-        # Add flow tags
-        tags.extend(parsed_request.flows)
+        # Domain tag first, then flow tags
+        tags = [_domain_of(target_url), *parsed_request.flows]
 
         # Add environment tags
         if len(parsed_request.required_viewports) > 1:
@@ -351,11 +372,11 @@ class TestPlanBuilder:
             tags.append("network-conditions")
 
         # Add special tags
-        if "pointblank.club" in target_url:
+        if is_pointblank:
             tags.append("pointblank")
             tags.append("demo")
 
-        if any(b in parsed_request.required_browsers for b in ["webkit-ios", "webkit-desktop"]):
+        if _SAFARI_BROWSERS.intersection(parsed_request.required_browsers):
             tags.append("safari")
 
         return tags
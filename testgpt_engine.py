@@ -10,17 +10,33 @@ Coordinates the entire testing pipeline:
 6. Persist everything
 """
 
-import uuid
+import asyncio
+import io
+import os
+import re
+import time
 import logging
+import threading
+import traceback
 import warnings
-from datetime import datetime
-from typing import Optional, Dict, Any, List
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from functools import lru_cache
+from itertools import count, islice
+from typing import Optional, Dict, Any, List, Set, Tuple
+from agno.agent import Agent
+from agno.models.anthropic import Claude
 from request_parser import SlackRequestParser
 from test_plan_builder import TestPlanBuilder
 from test_executor import TestExecutor
 from result_formatter import ResultFormatter
 from persistence import PersistenceLayer
-from models import RunArtifact, TestPlan, TestStatus
+from json_utils import json_dumps
+from models import (
+    RunArtifact, TestPlan, TestStatus, EnvironmentMatrix, CellResult, StepResult,
+    FailurePriority, ParsedSlackRequest
+)
+from config import VIEWPORT_PROFILES, BROWSER_PROFILES
 from mcp_manager import get_mcp_manager
 
 # Import database persistence
@@ -36,6 +52,209 @@ warnings.filterwarnings('ignore', category=RuntimeWarning, message='.*async_gene
 warnings.filterwarnings('ignore', category=RuntimeWarning, message='.*cancel scope.*')
 
 
+# Browser profiles _generate_mock_results treats as Safari
+_WEBKIT_BROWSER_NAMES = frozenset(name for name in BROWSER_PROFILES if "webkit" in name)
+
+# Failure summaries used by _generate_mock_results
+_MOCK_HERO_CTA_FAILURE = "{b} on {d}: Hero CTA button not visible in viewport".format
+_MOCK_PRICING_MODAL_FAILURE = "{b}: Pricing modal does not open on click".format
+_MOCK_TIMEOUT_FAILURE = "Page load timeout after 10 seconds on {n}".format
+
+# Verdict markers that directly precede or follow a scenario name in an
+# agent response (matched against the casefolded text)
+_PASS_PREFIXES = ("✅ ", "successfully completed ")
+_PASS_SUFFIXES = (" ✅", ": passed", " passed", ": success")
+_FAIL_PREFIXES = ("❌ ", "failed ")
+_FAIL_SUFFIXES = (" ❌", ": failed", " failed", ": error")
+
+
+# Whole-response indicators for the overall PR test verdict (matched
+# against the casefolded text)
+_PR_PASS_INDICATORS = ("all tests passed", "all scenarios passed", "✅", "success")
+_PR_FAIL_INDICATORS = ("failed", "error", "❌", "failure")
+
+# Every (possibly overlapping) occurrence of any verdict indicator, tagged
+# by kind, so one scan of the response decides both the pass and the fail
+# checks (no pass indicator starts where a fail indicator does)
+_PR_VERDICT_RE = re.compile(
+    "(?=(?P<passed>" + "|".join(map(re.escape, _PR_PASS_INDICATORS)) + ")"
+    "|(?P<failed>" + "|".join(map(re.escape, _PR_FAIL_INDICATORS)) + "))"
+)
+
+
+# Only the start and end of a long agent response are checked for the
+# verdict; that's where the agent summarizes, and it bounds the scan when
+# the response carries large logs in between
+_PR_VERDICT_HEAD_CHARS = 8192
+_PR_VERDICT_TAIL_CHARS = 4096
+
+
+def _pr_verdict(response_folded: str) -> Tuple[bool, bool]:
+    """
+    Check a casefolded agent response for pass and fail indicators.
+
+    Long responses are scanned in their first _PR_VERDICT_HEAD_CHARS and
+    last _PR_VERDICT_TAIL_CHARS characters only. Stops scanning as soon as
+    both kinds have been seen.
+
+    Returns:
+        (test_passed, test_failed)
+    """
+    if len(response_folded) > _PR_VERDICT_HEAD_CHARS + _PR_VERDICT_TAIL_CHARS:
+        # The newline keeps an indicator from being formed across the seam
+        response_folded = (
+            response_folded[:_PR_VERDICT_HEAD_CHARS] + "\n" + response_folded[-_PR_VERDICT_TAIL_CHARS:]
+        )
+
+    test_passed = test_failed = False
+    for match in _PR_VERDICT_RE.finditer(response_folded):
+        if match.lastgroup == "passed":
+            test_passed = True
+        else:
+            test_failed = True
+        if test_passed and test_failed:
+            break
+    return test_passed, test_failed
+
+
+# Agent response lines that start a failure block
+_FAILURE_LINE_RE = re.compile(r"^.*(?:❌|failed|error).*$", re.IGNORECASE | re.MULTILINE)
+
+
+@lru_cache(maxsize=32)
+def _scenario_matcher(
+    scenario_names: Tuple[str, ...]
+) -> Tuple[Tuple[str, ...], Optional[re.Pattern], Dict[str, Tuple[int, ...]]]:
+    """
+    Build the matcher for a PR's scenario names.
+
+    Returns the casefolded names, a regex finding every (possibly
+    overlapping) start position of any of them (None if there are none),
+    and the indices of the non-empty names grouped by first character, so a
+    match only has to be checked against names that can start there.
+    Keyed on the raw names, so PR re-runs over the same scenario set reuse
+    all three without casefolding or compiling again.
+    """
+    names = tuple(name.casefold() for name in scenario_names)
+
+    by_first_char: Dict[str, List[int]] = {}
+    for idx, name in enumerate(names):
+        if name:
+            by_first_char.setdefault(name[0], []).append(idx)
+
+    if not by_first_char:
+        return names, None, {}
+
+    unique_names = sorted({name for name in names if name}, key=len, reverse=True)
+    names_pattern = re.compile("(?=(?:" + "|".join(map(re.escape, unique_names)) + "))")
+    return names, names_pattern, {char: tuple(idxs) for char, idxs in by_first_char.items()}
+
+
+# Browser profiles PR tests run against (desktop-standard viewport), and how
+# many of them may drive a Playwright agent at once
+_PR_TEST_BROWSERS = ("chromium-desktop",)
+_PR_TEST_MAX_CONCURRENCY = 3
+
+# Model driving the PR test agent
+_PR_TEST_MODEL_ID = "claude-sonnet-4-20250514"
+
+
+# One scenario in the get_scenario_library listing
+_LIBRARY_ENTRY = "• %s\n  Target: %s\n  Tags: %s\n  Re-run: \"re-run %s\"\n"
+
+
+# Shape of IDs from SlackRequestParser.get_scenario_id
+_SCENARIO_ID_RE = re.compile(r"^scenario-[^\s/]+$")
+
+# Run ID suffixes: a per-process counter seeded from the OS RNG once at import,
+# so IDs stay unique within the process without a random read per run
+_run_id_counter = count(int.from_bytes(os.urandom(3), "big"))
+
+
+def _make_run_id(timestamp: datetime) -> str:
+    """Build a run ID of the form run-YYYYmmdd-HHMMSS-xxxxxx."""
+    return f"run-{timestamp.strftime('%Y%m%d-%H%M%S')}-{next(_run_id_counter) & 0xFFFFFF:06x}"
+
+
+@dataclass(frozen=True)
+class _EngineComponents:
+    """Engine components that hold no per-request state."""
+    parser: SlackRequestParser
+    plan_builder: TestPlanBuilder
+    formatter: ResultFormatter
+    persistence: PersistenceLayer
+
+
+@lru_cache(maxsize=4)
+def _make_engine_components(storage_dir: str) -> _EngineComponents:
+    """
+    Build (once per storage directory) the components shared by engines.
+
+    The executor is not shared: it keeps the agent for the run in progress
+    and its own debug log file.
+    """
+    return _EngineComponents(
+        parser=SlackRequestParser(),
+        plan_builder=TestPlanBuilder(),
+        formatter=ResultFormatter(),
+        persistence=PersistenceLayer(storage_dir)
+    )
+
+
+# General checks appended to every backend test instruction
+_BACKEND_TEST_GUIDELINES = (
+    "\n\nInclude:"
+    "\n1. API health check"
+    "\n2. Test all available endpoints"
+    "\n3. Verify CRUD operations work correctly"
+    "\n4. Check error handling"
+    "\n5. Run smoke tests if available"
+)
+
+
+@lru_cache(maxsize=256)
+def _build_backend_instructions_cached(
+    flows: Tuple[str, ...],
+    explicit_expectations: Tuple[str, ...],
+    raw_message: str
+) -> str:
+    """Build backend test instructions (see TestGPTEngine._build_backend_test_instructions)."""
+    # Sections are written straight into one buffer
+    buf = io.StringIO()
+
+    # Start with base instruction, adding flows/scenarios if specified
+    if flows:
+        buf.write("Test the following API flows: ")
+        buf.write(", ".join(flows))
+    else:
+        buf.write("Run comprehensive API tests")
+
+    # Add explicit expectations
+    if explicit_expectations:
+        buf.write("\n\nVerify these expectations:")
+        for exp in explicit_expectations:
+            buf.write("\n- ")
+            buf.write(exp)
+
+    # Add general testing guidelines
+    buf.write(_BACKEND_TEST_GUIDELINES)
+
+    # Use raw message for additional context
+    if raw_message:
+        buf.write("\n\nOriginal request: ")
+        buf.write(raw_message)
+
+    return buf.getvalue()
+
+
+# Step-by-step progress output. The engine only logs; entrypoints decide
+# where (and whether) it is shown.
+log = logging.getLogger(__name__)
+
+# Banner separator for console progress output
+_BANNER_RULE = "=" * 70
+
+
 class TestGPTEngine:
     """
     Main orchestration engine for TestGPT.
@@ -48,17 +267,35 @@ class TestGPTEngine:
         """
         Initialize TestGPT engine.
 
+        Step-by-step progress is logged at INFO on the "testgpt_engine"
+        logger; callers choose whether it is shown by configuring logging.
+
         Args:
             mcp_tools: (Deprecated) No longer used - using dynamic MCP manager
             storage_dir: Directory for persistence storage
         """
-        self.parser = SlackRequestParser()
-        self.plan_builder = TestPlanBuilder()
+        components = _make_engine_components(storage_dir)
+        self.parser = components.parser
+        self.plan_builder = components.plan_builder
         self.executor = TestExecutor()  # Always create executor (uses dynamic MCP manager)
-        self.formatter = ResultFormatter()
-        self.persistence = PersistenceLayer(storage_dir)
+        self.formatter = components.formatter
+        self.persistence = components.persistence
         self.mcp_manager = get_mcp_manager()
 
+        # Background work (MCP cleanup, DB saves) still running after its
+        # request returned. One engine may serve requests on several threads,
+        # each with its own event loop, so the set is guarded by a lock
+        self._background_tasks: Set[asyncio.Task] = set()
+        self._background_tasks_lock = threading.Lock()
+
+        # Rendered scenario library: (scenarios fingerprint, summary)
+        self._library_cache: Optional[Tuple[int, str]] = None
+
+        # DB test suite IDs by scenario name, so repeat runs skip the name
+        # lookup (each hit is still checked by primary key, since SQLite
+        # doesn't enforce the foreign key if the suite is deleted)
+        self._suite_ids: Dict[str, str] = {}
+
     async def process_test_request(
         self,
         slack_message: str,
@@ -83,32 +320,45 @@ class TestGPTEngine:
         Returns:
             Formatted Slack summary message
         """
-        print("\n" + "=" * 70)
-        print(" TestGPT Processing Request")
-        print("=" * 70)
-        print(f"Message: {slack_message}")
-        print(f"User: {user_id}\n")
+        log.info(
+            "\n%s\n TestGPT Processing Request\n%s\nMessage: %s\nUser: %s\n",
+            _BANNER_RULE, _BANNER_RULE, slack_message, user_id
+        )
+
+        # One clock read per request: run ID, last_run_at and mock timestamps
+        # all use the time the request came in
+        request_time = datetime.now()
 
         # Step 1: Parse request
-        print(" Step 1: Parsing Slack request...")
+        log.info(" Step 1: Parsing Slack request...")
         parsed_request = self.parser.parse(slack_message, user_id)
 
-        print(f"   Target URL: {parsed_request.target_urls[0]}")
-        print(f"   Flows: {', '.join(parsed_request.flows)}")
-        print(f"   Viewports: {', '.join(parsed_request.required_viewports)}")
-        print(f"   Browsers: {', '.join(parsed_request.required_browsers)}")
-        print(f"   Networks: {', '.join(parsed_request.required_networks)}")
-        print(f"   Is Re-run: {parsed_request.is_rerun}\n")
+        target_url = parsed_request.target_urls[0]
+        flows = parsed_request.flows
+        viewports = parsed_request.required_viewports
+        browsers = parsed_request.required_browsers
+        networks = parsed_request.required_networks
+        is_rerun = parsed_request.is_rerun
+
+        log.info(
+            "   Target URL: %s\n"
+            "   Flows: %s\n"
+            "   Viewports: %s\n"
+            "   Browsers: %s\n"
+            "   Networks: %s\n"
+            "   Is Re-run: %s\n",
+            target_url, ', '.join(flows), ', '.join(viewports),
+            ', '.join(browsers), ', '.join(networks), is_rerun
+        )
 
         # Step 2: Check for re-run
-        if parsed_request.is_rerun:
+        if is_rerun:
             return await self._handle_rerun(parsed_request, user_id)
 
         # Step 3: Build test plan
-        print("  Step 2: Building test plan with matrix expansion...")
+        log.info("  Step 2: Building test plan with matrix expansion...")
 
-        scenario_id = self.parser.get_scenario_id(parsed_request)
-        scenario_name = self.parser.get_scenario_name(parsed_request)
+        scenario_id, scenario_name = self.parser.get_scenario_identity(parsed_request)
 
         test_plan = self.plan_builder.build_test_plan(
             parsed_request=parsed_request,
@@ -117,27 +367,30 @@ class TestGPTEngine:
             created_by=user_id
         )
 
-        print(f"   Scenario: {test_plan.scenario_name}")
-        print(f"   Matrix cells: {test_plan.total_cells_to_execute}")
-        print(f"   Estimated duration: {test_plan.estimated_duration_minutes} minutes\n")
+        log.info("   Scenario: %s", test_plan.scenario_name)
+        log.info("   Matrix cells: %s", test_plan.total_cells_to_execute)
+        log.info("   Estimated duration: %s minutes\n", test_plan.estimated_duration_minutes)
 
         # Step 4: Save scenario definition
-        print(" Step 3: Saving scenario definition for re-run capability...")
+        log.info(" Step 3: Saving scenario definition for re-run capability...")
         scenario_def = self.plan_builder.build_scenario_definition(test_plan, user_id)
-        self.persistence.save_scenario(scenario_def)
-        print()
+
+        # Saved before execution, so the scenario can be re-run even if
+        # this run crashes
+        await asyncio.to_thread(self.persistence.save_scenario, scenario_def)
+        log.info("")
 
         # Step 5: Execute tests (if executor available)
         try:
             # Check if this is a PR test
             if parsed_request.is_pr_test:
-                print(" Step 4: Executing PR-based tests...")
+                log.info(" Step 4: Executing PR-based tests...")
                 pr_result = await self._handle_pr_test(parsed_request, user_id)
                 return pr_result
 
             # Check if this is a backend API test
             if parsed_request.is_backend_api_test:
-                print(" Step 4: Executing backend API tests...")
+                log.info(" Step 4: Executing backend API tests...")
 
                 # Build test instructions from parsed request
                 test_instructions = self._build_backend_test_instructions(parsed_request)
@@ -155,17 +408,18 @@ class TestGPTEngine:
 
             # Regular Playwright testing
             if self.executor:
-                print("  Step 4: Executing test matrix...")
+                log.info("  Step 4: Executing test matrix...")
                 cell_results = await self.executor.execute_test_plan(test_plan)
-                print(f"   Completed {len(cell_results)} cells\n")
+                log.info("   Completed %s cells\n", len(cell_results))
             else:
-                print("  Step 4: Skipping execution (no MCP tools connected)")
-                print("   Generating mock results for demonstration...\n")
-                cell_results = self._generate_mock_results(test_plan)
+                log.info("  Step 4: Skipping execution (no MCP tools connected)")
+                log.info("   Generating mock results for demonstration...\n")
+                cell_results = await asyncio.to_thread(self._generate_mock_results, test_plan, request_time)
 
             # Step 6: Aggregate results
-            print(" Step 5: Aggregating results...")
-            run_id = f"run-{datetime.now().strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}"
+            log.info(" Step 5: Aggregating results...")
+            run_timestamp = request_time
+            run_id = _make_run_id(run_timestamp)
 
             run_artifact = self.formatter.aggregate_results(
                 cell_results=cell_results,
@@ -179,44 +433,81 @@ class TestGPTEngine:
             run_artifact.scenario_id = test_plan.scenario_id
             run_artifact.triggered_by = user_id
 
-            print(f"   Overall status: {run_artifact.overall_status.value}")
-            print(f"   Pass rate: {run_artifact.passed_cells}/{run_artifact.total_cells}\n")
-
-            # Step 7: Save run artifact
-            print(" Step 6: Saving run artifact...")
-            self.persistence.save_run_artifact(run_artifact)
-            self.persistence.update_scenario_last_run(scenario_id, datetime.now())
+            log.info("   Overall status: %s", run_artifact.overall_status.value)
+            log.info("   Pass rate: %s/%s\n", run_artifact.passed_cells, run_artifact.total_cells)
 
-            # Save to database for frontend display
-            self._save_execution_to_database(run_artifact, test_plan)
-            print()
+            # Steps 7 & 8: Save run artifact and format Slack summary.
+            # Both only read run_artifact, so the disk writes and formatting
+            # overlap.
+            log.info(" Step 6: Saving run artifact...")
 
-            # Step 8: Format Slack summary
-            print("  Step 7: Formatting Slack summary...")
-            slack_summary = self.formatter.format_slack_summary(run_artifact)
-            print()
+            # Save to database for frontend display, without holding up the
+            # summary on the DB round-trips
+            self._run_in_background(
+                asyncio.to_thread(self._save_execution_to_database, run_artifact, test_plan)
+            )
 
-            print("=" * 70)
-            print(" TestGPT Processing Complete")
-            print("=" * 70 + "\n")
+            _, slack_summary = await asyncio.gather(
+                asyncio.to_thread(
+                    self.persistence.save_run_bundle, scenario_def, run_artifact, run_timestamp
+                ),
+                asyncio.to_thread(self.formatter.format_slack_summary, run_artifact)
+            )
+            log.info(
+                "\n  Step 7: Formatting Slack summary...\n\n%s\n TestGPT Processing Complete\n%s\n",
+                _BANNER_RULE, _BANNER_RULE
+            )
 
             return slack_summary
 
         finally:
-            # Always cleanup MCP servers after execution (success or failure)
-            # Suppress MCP async generator cleanup warnings (known issue with stdio connections)
-            try:
-                await self.mcp_manager.cleanup_all()
-            except RuntimeError as e:
-                if "cancel scope" in str(e):
-                    # Known issue: MCP stdio async generators cleanup in different task
-                    # This is cosmetic and doesn't affect functionality
-                    pass
-                else:
-                    raise
-            except Exception as e:
-                # Log other errors but don't fail the request
-                print(f"  Warning during MCP cleanup: {e}")
+            # Always cleanup MCP servers after execution (success or failure),
+            # in the background so the summary is returned without waiting on it
+            self._run_in_background(self._cleanup_mcp_servers())
+
+    def _run_in_background(self, coro):
+        """Run a coroutine as a task tracked until done, for drain() to await."""
+        task = asyncio.create_task(coro)
+        with self._background_tasks_lock:
+            self._background_tasks.add(task)
+        task.add_done_callback(self._forget_background_task)
+
+    def _forget_background_task(self, task: asyncio.Task):
+        """Stop tracking a finished background task."""
+        with self._background_tasks_lock:
+            self._background_tasks.discard(task)
+
+    async def _cleanup_mcp_servers(self):
+        """Cleanup all MCP servers, logging (not raising) any errors."""
+        # Suppress MCP async generator cleanup warnings (known issue with stdio connections)
+        try:
+            await self.mcp_manager.cleanup_all()
+        except RuntimeError as e:
+            if "cancel scope" in str(e):
+                # Known issue: MCP stdio async generators cleanup in different task
+                # This is cosmetic and doesn't affect functionality
+                pass
+            else:
+                log.warning("  Warning during MCP cleanup: %s", e)
+        except Exception as e:
+            # Log other errors but don't fail the request
+            log.warning("  Warning during MCP cleanup: %s", e)
+
+    async def drain(self):
+        """
+        Wait for background MCP cleanups and DB saves to finish.
+
+        Callers that own the event loop (e.g. via asyncio.run) should await
+        this before the loop closes so that work isn't cancelled midway.
+        Only tasks started on the calling loop are awaited; requests served
+        on other threads drain their own.
+        """
+        loop = asyncio.get_running_loop()
+        with self._background_tasks_lock:
+            tasks = [task for task in self._background_tasks if task.get_loop() is loop]
+
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
 
     async def _handle_rerun(self, parsed_request, user_id: str) -> str:
         """
@@ -224,64 +515,46 @@ class TestGPTEngine:
 
         Finds the matching scenario and re-executes it.
         """
-        print(" Handling re-run request...")
+        log.info(" Handling re-run request...")
 
         reference = parsed_request.rerun_scenario_reference
 
         # Handle special keywords like "last", "last test", "latest", etc.
+        # The resolved scenario is used as is, and a reference shaped like
+        # scenario-{domain}-{flow}-{hash} is loaded directly, so the name
+        # and URL scans only run when neither finds a scenario
+        scenario_dict = None
         if reference and reference.lower() in ['last', 'last test', 'most recent', 'latest']:
             # Get the most recently run scenario
-            all_scenarios = self.persistence.list_all_scenarios()
-            if all_scenarios:
-                # Load full scenario data to get last_run_at
-                scenarios_with_dates = []
-                for s in all_scenarios:
-                    full_scenario = self.persistence.load_scenario(s['scenario_id'])
-                    if full_scenario:
-                        scenarios_with_dates.append(full_scenario)
-
-                # Sort by last_run_at or created_at
-                sorted_scenarios = sorted(
-                    scenarios_with_dates,
-                    key=lambda s: s.get('last_run_at') or s.get('created_at', ''),
-                    reverse=True
-                )
-                if sorted_scenarios:
-                    reference = sorted_scenarios[0]['scenario_id']
-                    print(f"    'last test' resolved to: {sorted_scenarios[0]['scenario_name']}")
+            scenario_dict = await asyncio.to_thread(self._find_last_run_scenario)
+            if scenario_dict:
+                log.info("    'last test' resolved to: %s", scenario_dict['scenario_name'])
+        elif _SCENARIO_ID_RE.match(reference or ""):
+            scenario_dict = await asyncio.to_thread(self.persistence.load_scenario, reference)
 
-        # Try to find matching scenario
-        # First by exact ID
-        scenario_dict = self.persistence.load_scenario(reference)
-
-        # If not found, search by name
         if not scenario_dict:
-            matching_ids = self.persistence.find_scenarios_by_name(reference)
-
-            if not matching_ids:
-                # Try by URL
-                matching_ids = self.persistence.find_scenarios_by_url(reference)
+            # Fall back to name matches, then URL matches. The scans are
+            # independent, so run them concurrently
+            name_matches, url_matches = await asyncio.gather(
+                asyncio.to_thread(self.persistence.find_scenarios_by_name, reference),
+                asyncio.to_thread(self.persistence.find_scenarios_by_url, reference)
+            )
+            matching_ids = name_matches or url_matches
 
             if matching_ids:
-                scenario_dict = self.persistence.load_scenario(matching_ids[0])
+                scenario_dict = await asyncio.to_thread(self.persistence.load_scenario, matching_ids[0])
 
         if not scenario_dict:
+            available_names = await asyncio.to_thread(self.persistence.list_scenario_names, 5)
             return (
                 f" Could not find scenario matching '{reference}'\n\n"
                 f"Available scenarios:\n" +
-                "\n".join(
-                    f"  • {s['scenario_name']}"
-                    for s in self.persistence.list_all_scenarios()[:5]
-                )
+                "\n".join(f"  • {name}" for name in available_names)
             )
 
         # Reconstruct parsed request from scenario
-        print(f"   Found scenario: {scenario_dict['scenario_name']}")
-        print(f"   Re-executing with saved configuration...\n")
-
-        # Reconstruct ParsedSlackRequest from saved scenario
-        from request_parser import ParsedSlackRequest
-        from models import EnvironmentMatrix
+        log.info("   Found scenario: %s", scenario_dict['scenario_name'])
+        log.info("   Re-executing with saved configuration...\n")
 
         # Reconstruct environment matrix
         env_matrix_dict = scenario_dict.get('environment_matrix', {})
@@ -320,11 +593,10 @@ class TestGPTEngine:
         )
 
         # Execute the test as if it's a new request
-        print(f"    Executing re-run...\n")
+        log.info("    Executing re-run...\n")
 
         # Build test plan from reconstructed request
-        scenario_id = self.parser.get_scenario_id(reconstructed_request)
-        scenario_name = self.parser.get_scenario_name(reconstructed_request)
+        scenario_id, scenario_name = self.parser.get_scenario_identity(reconstructed_request)
 
         test_plan = self.plan_builder.build_test_plan(
             parsed_request=reconstructed_request,
@@ -333,18 +605,20 @@ class TestGPTEngine:
             created_by=user_id
         )
 
-        print(f"   Scenario: {test_plan.scenario_name}")
-        print(f"   Matrix cells: {test_plan.total_cells_to_execute}")
-        print(f"   Estimated duration: {test_plan.estimated_duration_minutes} minutes\n")
+        log.info("   Scenario: %s", test_plan.scenario_name)
+        log.info("   Matrix cells: %s", test_plan.total_cells_to_execute)
+        log.info("   Estimated duration: %s minutes\n", test_plan.estimated_duration_minutes)
 
         # Execute tests
-        print("  Executing test matrix...")
+        log.info("  Executing test matrix...")
         cell_results = await self.executor.execute_test_plan(test_plan)
-        print(f"   Completed {len(cell_results)} cells\n")
+        log.info("   Completed %s cells\n", len(cell_results))
 
         # Aggregate results
-        print(" Aggregating results...")
-        run_id = f"run-{datetime.now().strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}"
+        log.info(" Aggregating results...")
+        # One timestamp for both the run ID and the scenario's last_run_at
+        run_timestamp = datetime.now()
+        run_id = _make_run_id(run_timestamp)
 
         run_artifact = self.formatter.aggregate_results(
             cell_results=cell_results,
@@ -358,95 +632,100 @@ class TestGPTEngine:
         run_artifact.scenario_id = test_plan.scenario_id
         run_artifact.triggered_by = user_id
 
-        print(f"   Overall status: {run_artifact.overall_status.value}")
-        print(f"   Pass rate: {run_artifact.passed_cells}/{run_artifact.total_cells}\n")
+        log.info("   Overall status: %s", run_artifact.overall_status.value)
+        log.info("   Pass rate: %s/%s\n", run_artifact.passed_cells, run_artifact.total_cells)
 
         # Save run artifact
-        print(" Saving run artifact...")
-        self.persistence.save_run_artifact(run_artifact)
-
-        # Save to database for frontend display
-        self._save_execution_to_database(run_artifact, test_plan)
+        log.info(" Saving run artifact...")
 
-        # Update scenario's last_run_at timestamp
-        scenario_dict['last_run_at'] = datetime.now().isoformat()
+        # Save to database for frontend display, in the background
+        self._run_in_background(
+            asyncio.to_thread(self._save_execution_to_database, run_artifact, test_plan)
+        )
 
-        # Save the updated scenario
-        import json
-        from pathlib import Path
-        scenario_file = self.persistence.scenarios_dir / f"{scenario_dict['scenario_id']}.json"
-        with open(scenario_file, 'w') as f:
-            json.dump(scenario_dict, f, indent=2, default=str)
+        # The run file and scenario update are independent, so they overlap
+        await asyncio.gather(
+            asyncio.to_thread(self.persistence.save_run_artifact, run_artifact),
+            # Update scenario's last_run_at timestamp (through persistence,
+            # so the scenario index sees it too)
+            asyncio.to_thread(
+                self.persistence.update_scenario_last_run, scenario_dict['scenario_id'], run_timestamp
+            )
+        )
 
         # Format Slack summary
-        print("  Formatting Slack summary...\n")
+        log.info("  Formatting Slack summary...\n")
         slack_summary = self.formatter.format_slack_summary(run_artifact)
 
-        print("=" * 70)
-        print(" Re-run Complete")
-        print("=" * 70 + "\n")
+        log.info("%s\n Re-run Complete\n%s\n", _BANNER_RULE, _BANNER_RULE)
 
         return slack_summary
 
-    def _generate_mock_results(self, test_plan: TestPlan):
+    def _find_last_run_scenario(self) -> Optional[dict]:
         """
-        Generate mock cell results for demonstration when no executor is available.
+        Find the most recently run scenario (by last_run_at, else created_at).
 
-        Simulates some failures to showcase the reporting system.
+        Blocking: may read the scenario index and reads the newest scenario
+        file, so callers on the event loop run it in a worker thread.
         """
-        from models import CellResult, StepResult, TestStatus, FailurePriority
-        from datetime import datetime
+        return self.persistence.load_most_recent_scenario()
 
+    def _generate_mock_results(self, test_plan: TestPlan, now: datetime):
+        """
+        Generate mock cell results for demonstration when no executor is available.
+
+        Simulates some failures to showcase the reporting system. Every
+        timestamp in the results is the given request time.
+        """
         mock_results = []
-        now = datetime.now()
-
-        for i, cell in enumerate(test_plan.matrix_cells):
-            # Simulate Safari failures and Chrome successes
-            is_safari = "webkit" in cell.browser.name
-            is_mobile = cell.viewport.is_mobile
-            is_slow_network = cell.network.name != "normal"
-
-            # Safari on mobile with slow network fails
-            if is_safari and is_mobile and is_slow_network:
-                status = TestStatus.FAIL
-                failure_summary = f"{cell.browser.display_name} on {cell.viewport.device_class}: Hero CTA button not visible in viewport"
-                failure_priority = FailurePriority.P0
-            # Safari on desktop fails sometimes
-            elif is_safari and not is_mobile and i % 3 == 0:
-                status = TestStatus.FAIL
-                failure_summary = f"{cell.browser.display_name}: Pricing modal does not open on click"
-                failure_priority = FailurePriority.P0
-            # Slow network causes some failures
-            elif is_slow_network and i % 4 == 0:
-                status = TestStatus.FAIL
-                failure_summary = f"Page load timeout after 10 seconds on {cell.network.display_name}"
-                failure_priority = FailurePriority.P1
-            else:
-                status = TestStatus.PASS
-                failure_summary = None
-                failure_priority = None
+        cells = test_plan.matrix_cells
+
+        # Profile names are read once per cell and environment flags are
+        # computed column-wise, then all cells are classified in one pass
+        # before building any results
+        viewport_names = [cell.viewport.name for cell in cells]
+        browser_names = [cell.browser.name for cell in cells]
+        network_names = [cell.network.name for cell in cells]
+
+        is_safari = [name in _WEBKIT_BROWSER_NAMES for name in browser_names]
+        is_mobile = [cell.viewport.is_mobile for cell in cells]
+        is_slow_network = [name != "normal" for name in network_names]
+
+        outcomes = [
+            self._classify_mock_cell(i, cell, safari, mobile, slow)
+            for i, (cell, safari, mobile, slow) in enumerate(
+                zip(cells, is_safari, is_mobile, is_slow_network)
+            )
+        ]
 
-            # Create mock step results
+        passed_status = TestStatus.PASS
+
+        for i, (cell, (status, failure_summary, failure_priority)) in enumerate(zip(cells, outcomes)):
+            # Create mock step results: the per-cell values are decided
+            # once, so each step only builds its StepResult
+            passed = status is passed_status
+            error_message = None if passed else failure_summary
+            step_duration_ms = 1000 + (i * 100)
             step_results = [
                 StepResult(
                     step_number=step.step_number,
                     action=step.action.value,
                     target=step.target,
                     expected_outcome=step.expected_outcome,
-                    actual_outcome=step.expected_outcome if status == TestStatus.PASS else "Failed",
-                    passed=(status == TestStatus.PASS),
+                    actual_outcome=step.expected_outcome if passed else "Failed",
+                    passed=passed,
                     timestamp=now,
-                    error_message=failure_summary if status == TestStatus.FAIL else None,
-                    duration_ms=1000 + (i * 100)
+                    error_message=error_message,
+                    duration_ms=step_duration_ms
                 )
                 for step in cell.steps
             ]
 
             mock_results.append(CellResult(
                 cell_id=cell.cell_id,
-                viewport=cell.viewport.name,
-                browser=cell.browser.name,
-                network=cell.network.name,
+                viewport=viewport_names[i],
+                browser=browser_names[i],
+                network=network_names[i],
                 status=status,
                 started_at=now,
                 completed_at=now,
@@ -461,6 +740,39 @@ class TestGPTEngine:
 
         return mock_results
 
+    @staticmethod
+    def _classify_mock_cell(i: int, cell, is_safari: bool, is_mobile: bool, is_slow_network: bool):
+        """
+        Decide the simulated outcome for one matrix cell.
+
+        Simulates Safari failures and Chrome successes.
+
+        Returns:
+            (status, failure_summary, failure_priority) tuple
+        """
+        # Safari on mobile with slow network fails
+        if is_safari and is_mobile and is_slow_network:
+            return (
+                TestStatus.FAIL,
+                _MOCK_HERO_CTA_FAILURE(b=cell.browser.display_name, d=cell.viewport.device_class),
+                FailurePriority.P0
+            )
+        # Safari on desktop fails sometimes
+        if is_safari and not is_mobile and i % 3 == 0:
+            return (
+                TestStatus.FAIL,
+                _MOCK_PRICING_MODAL_FAILURE(b=cell.browser.display_name),
+                FailurePriority.P0
+            )
+        # Slow network causes some failures
+        if is_slow_network and i % 4 == 0:
+            return (
+                TestStatus.FAIL,
+                _MOCK_TIMEOUT_FAILURE(n=cell.network.display_name),
+                FailurePriority.P1
+            )
+        return TestStatus.PASS, None, None
+
     def get_scenario_library(self) -> str:
         """
         Get a formatted list of saved scenarios.
@@ -468,21 +780,29 @@ class TestGPTEngine:
         Returns:
             Formatted string listing all scenarios
         """
-        scenarios = self.persistence.list_all_scenarios()
+        # Re-render only when a scenario file has been added or changed
+        fingerprint = self.persistence.scenarios_fingerprint()
+        if self._library_cache and self._library_cache[0] == fingerprint:
+            return self._library_cache[1]
+
+        # Only the 10 most recent scenarios are shown, so only those are read
+        scenarios = self.persistence.list_scenarios(10)
 
         if not scenarios:
             return "No saved scenarios yet. Run a test to create one!"
 
-        lines = [" Saved Test Scenarios\n"]
-
-        for scenario in scenarios[:10]:  # Limit to 10
-            lines.append(f"• {scenario['scenario_name']}")
-            lines.append(f"  Target: {scenario['target_url']}")
-            lines.append(f"  Tags: {', '.join(scenario.get('tags', []))}")
-            lines.append(f"  Re-run: \"re-run {scenario['scenario_name'].split(' - ')[0].lower()}\"")
-            lines.append("")
+        library = " Saved Test Scenarios\n\n" + "\n".join(
+            _LIBRARY_ENTRY % (
+                scenario['scenario_name'],
+                scenario['target_url'],
+                ', '.join(scenario.get('tags', ())),
+                scenario['scenario_name'].split(' - ', 1)[0].lower()
+            )
+            for scenario in scenarios
+        )
 
-        return "\n".join(lines)
+        self._library_cache = (fingerprint, library)
+        return library
 
     def _build_backend_test_instructions(self, parsed_request) -> str:
         """
@@ -494,34 +814,12 @@ class TestGPTEngine:
         Returns:
             Test instructions string for the backend testing agent
         """
-        # Start with base instruction
-        instructions = []
-
-        # Add flows/scenarios if specified
-        if parsed_request.flows:
-            flow_descriptions = ', '.join(parsed_request.flows)
-            instructions.append(f"Test the following API flows: {flow_descriptions}")
-        else:
-            instructions.append("Run comprehensive API tests")
-
-        # Add explicit expectations
-        if parsed_request.explicit_expectations:
-            expectations = '\n'.join(f"- {exp}" for exp in parsed_request.explicit_expectations)
-            instructions.append(f"\nVerify these expectations:\n{expectations}")
-
-        # Add general testing guidelines
-        instructions.append("\nInclude:")
-        instructions.append("1. API health check")
-        instructions.append("2. Test all available endpoints")
-        instructions.append("3. Verify CRUD operations work correctly")
-        instructions.append("4. Check error handling")
-        instructions.append("5. Run smoke tests if available")
-
-        # Use raw message for additional context
-        if parsed_request.raw_message:
-            instructions.append(f"\nOriginal request: {parsed_request.raw_message}")
-
-        return "\n".join(instructions)
+        # Identical requests (re-runs, retries) reuse the built string
+        return _build_backend_instructions_cached(
+            tuple(parsed_request.flows),
+            tuple(parsed_request.explicit_expectations),
+            parsed_request.raw_message
+        )
 
     async def _handle_pr_test(self, parsed_request, user_id: str) -> str:
         """
@@ -534,6 +832,8 @@ class TestGPTEngine:
         Returns:
             Formatted Slack summary
         """
+        # Deferred: importing pr_testing loads the GitHub client stack and
+        # puts backend/ on sys.path, which only PR tests need
         from pr_testing import PRTestOrchestrator
         from pr_testing.pr_persistence import PRTestPersistence
 
@@ -564,7 +864,7 @@ class TestGPTEngine:
             pr_test_result["triggered_by_user"] = user_id
             pr_test_result["custom_instructions"] = parsed_request.raw_message
 
-            test_run_id = persistence.save_pr_test_start(pr_test_result)
+            test_run_id = await asyncio.to_thread(persistence.save_pr_test_start, pr_test_result)
             if test_run_id:
                 pr_test_result["test_run_id"] = test_run_id
 
@@ -586,7 +886,7 @@ class TestGPTEngine:
                 deployment_url = pr_test_result["test_context"]["deployment_url"]
                 agent_instructions = pr_test_result["test_context"]["agent_instructions"]
 
-                print("\n Executing tests with Playwright agent...")
+                log.info("\n Executing tests with Playwright agent...")
 
                 # Execute using existing TestExecutor
                 # Create a simple test with the deployment URL and instructions
@@ -598,7 +898,7 @@ class TestGPTEngine:
 
                 # Update database with test results
                 if test_run_id:
-                    persistence.update_pr_test_results(test_run_id, test_result)
+                    await asyncio.to_thread(persistence.update_pr_test_results, test_run_id, test_result)
 
                 # Format Slack summary
                 slack_summary = orchestrator.format_slack_summary(
@@ -611,9 +911,8 @@ class TestGPTEngine:
             return orchestrator.format_slack_summary(pr_test_result=pr_test_result)
 
         except Exception as e:
-            import traceback
-            error_trace = traceback.format_exc()
-            print(f" Error in PR testing: {e}\n{error_trace}")
+            # The traceback is only rendered when the record is emitted
+            log.exception(" Error in PR testing: %s", e)
 
             return (
                 f" **PR Testing Failed**\n\n"
@@ -631,6 +930,10 @@ class TestGPTEngine:
         """
         Execute PR tests using Playwright agent.
 
+        Each browser in _PR_TEST_BROWSERS gets its own agent run; the runs are
+        gathered concurrently (at most _PR_TEST_MAX_CONCURRENCY at a time)
+        and merged into a single result.
+
         Args:
             deployment_url: Deployment URL to test
             instructions: Test instructions for agent
@@ -639,84 +942,144 @@ class TestGPTEngine:
         Returns:
             Test execution results
         """
-        from agno.agent import Agent
-        from agno.tools.mcp import MCPTools
-        from datetime import datetime
+        if len(_PR_TEST_BROWSERS) == 1:
+            return await self._run_single_browser(
+                _PR_TEST_BROWSERS[0], deployment_url, instructions, pr_context
+            )
+
+        semaphore = asyncio.Semaphore(_PR_TEST_MAX_CONCURRENCY)
+
+        async def run_bounded(browser_name: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self._run_single_browser(
+                    browser_name, deployment_url, instructions, pr_context
+                )
+
+        results = await asyncio.gather(
+            *(run_bounded(browser_name) for browser_name in _PR_TEST_BROWSERS),
+            return_exceptions=True
+        )
+        return self._merge_browser_results(results)
+
+    @staticmethod
+    def _merge_browser_results(results: List[Any]) -> Dict[str, Any]:
+        """
+        Merge per-browser PR test results into one result.
+
+        The run fails if any browser failed; counts are summed and scenario
+        results and failures concatenated. If no browser produced results,
+        the first error is returned.
+        """
+        errors = []
+        completed = []
+        for result in results:
+            if isinstance(result, BaseException):
+                errors.append({"success": False, "error": str(result), "error_trace": ""})
+            elif result.get("success"):
+                completed.append(result)
+            else:
+                errors.append(result)
+
+        if not completed:
+            return errors[0]
+
+        merged = dict(completed[0])
+        merged.update(
+            success=not errors,
+            overall_status=(
+                "FAIL" if errors or any(r["overall_status"] != "PASS" for r in completed) else "PASS"
+            ),
+            passed_count=sum(r["passed_count"] for r in completed),
+            total_count=sum(r["total_count"] for r in completed),
+            duration_ms=max(r["duration_ms"] for r in completed),
+            agent_response="\n\n".join(r["agent_response"] for r in completed)[:2000],
+            scenario_results=[s for r in completed for s in r["scenario_results"]],
+            failures=[f for r in completed for f in r["failures"]]
+            + [{"scenario": "Browser run failed", "error": e["error"]} for e in errors],
+            console_errors=[c for r in completed for c in r["console_errors"]],
+            started_at=min(r["started_at"] for r in completed),
+            completed_at=max(r["completed_at"] for r in completed),
+        )
+        return merged
+
+    async def _run_single_browser(
+        self,
+        browser_name: str,
+        deployment_url: str,
+        instructions: str,
+        pr_context: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Execute PR tests using Playwright agent in one browser.
 
+        Args:
+            browser_name: Key into BROWSER_PROFILES
+            deployment_url: Deployment URL to test
+            instructions: Test instructions for agent
+            pr_context: Full PR context
+
+        Returns:
+            Test execution results
+        """
         try:
             # Get MCP manager and create instance for this test
-            print(f"    Starting Playwright MCP instance...")
-
-            # Use desktop-standard viewport and chromium-desktop browser
-            # This matches the normal testing flow configuration
-            from models import ViewportProfile, BrowserProfile
-            from config import VIEWPORT_PROFILES, BROWSER_PROFILES
+            log.info("    Starting Playwright MCP instance...")
 
+            # Use desktop-standard viewport, matching the normal testing
+            # flow configuration
             viewport = VIEWPORT_PROFILES["desktop-standard"]
-            browser_profile = BROWSER_PROFILES["chromium-desktop"]
+            browser_profile = BROWSER_PROFILES[browser_name]
 
-            print(f"    Testing with {browser_profile.name} browser")
+            log.info("    Testing with %s browser", browser_profile.name)
 
-            # Connect to MCP using the proper manager (same as normal tests)
+            # Get a pooled MCP connection from the manager (same as normal tests)
             mcp_tools = await self.mcp_manager.get_mcp_tools_for_cell(viewport, browser_profile)
 
-            print(f"    Playwright MCP connected")
+            log.info("    Playwright MCP connected")
 
             # Create agent with Claude model
-            from agno.models.anthropic import Claude
-
             pr_agent = Agent(
                 name="PRTestAgent",
-                model=Claude(id="claude-sonnet-4-20250514"),
+                model=Claude(id=_PR_TEST_MODEL_ID),
                 tools=[mcp_tools],
                 markdown=True,
                 debug_mode=True
             )
 
-            print(f"    Executing test scenarios...")
+            log.info("    Executing test scenarios...")
 
+            # Wall-clock start for the record; the duration is measured on
+            # the monotonic clock so clock adjustments can't skew it
             start_time = datetime.now()
+            start_monotonic = time.monotonic()
 
             # Run tests
             response = await pr_agent.arun(instructions)
 
-            end_time = datetime.now()
-            duration_ms = int((end_time - start_time).total_seconds() * 1000)
+            elapsed = time.monotonic() - start_monotonic
+            end_time = start_time + timedelta(seconds=elapsed)
+            duration_ms = int(elapsed * 1000)
 
-            print(f"    Test execution completed ({duration_ms}ms)")
+            log.info("    Test execution completed (%sms)", duration_ms)
 
-            # Parse results from agent response
+            # Parse results from agent response; the casefolded copy is
+            # made once and shared by every check below
             response_text = str(response)
+            response_folded = response_text.casefold()
 
             # Simple pass/fail detection
-            test_passed = any(indicator in response_text.lower() for indicator in [
-                "all tests passed",
-                "all scenarios passed",
-                "",
-                "success"
-            ])
-
-            test_failed = any(indicator in response_text.lower() for indicator in [
-                "failed",
-                "error",
-                "",
-                "failure"
-            ])
+            test_passed, test_failed = _pr_verdict(response_folded)
 
             # Count scenarios (rough estimate from response)
             scenario_count = len(pr_context.get("test_context", {}).get("test_scenarios", []))
 
-            # Cleanup MCP with proper error handling
-            try:
-                await mcp_tools.disconnect()
-            except RuntimeError as e:
-                if "cancel scope" in str(e) or "asyncgen" in str(e):
-                    # Known cosmetic issue with stdio cleanup - safe to ignore
-                    pass
-                else:
-                    print(f"     MCP cleanup warning: {e}")
-            except Exception as e:
-                print(f"     MCP cleanup error: {e}")
+            scenario_results, failures = self._parse_response(
+                response_text, response_folded, pr_context, test_failed
+            )
+
+            # The connection stays registered with the MCP manager, so later
+            # lookups for the same viewport/browser reuse the running server;
+            # the manager releases it in the request-end cleanup_all()
 
             return {
                 "success": True,
@@ -727,17 +1090,16 @@ class TestGPTEngine:
                 "total_count": scenario_count,
                 "duration_ms": duration_ms,
                 "agent_response": response_text[:2000],  # Truncate for summary
-                "scenario_results": self._parse_scenario_results(response_text, pr_context),
-                "failures": self._extract_failures(response_text) if test_failed else [],
+                "scenario_results": scenario_results,
+                "failures": failures,
                 "console_errors": [],
                 "started_at": start_time,
                 "completed_at": end_time
             }
 
         except Exception as e:
-            import traceback
             error_trace = traceback.format_exc()
-            print(f"    Test execution failed: {e}")
+            log.error("    Test execution failed: %s", e)
 
             return {
                 "success": False,
@@ -745,97 +1107,138 @@ class TestGPTEngine:
                 "error_trace": error_trace
             }
 
-    def _parse_scenario_results(self, response_text: str, pr_context: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def _parse_response(
+        self,
+        response_text: str,
+        response_folded: str,
+        pr_context: Dict[str, Any],
+        test_failed: bool
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
         """
-        Parse scenario results from agent response with improved detection.
+        Parse scenario results and failure details from agent response.
+
+        Uses multiple indicators to determine each scenario's pass/fail
+        status. Failure lines are found in a single scan that serves both the
+        scenario failure reasons and, if test_failed, the failure details.
+        response_folded must be response_text.casefold(), computed once by
+        the caller.
 
-        Uses multiple indicators to determine pass/fail status.
+        Returns:
+            (scenario_results, failures)
         """
         scenarios = pr_context.get("test_context", {}).get("test_scenarios", [])
-        results = []
-
-        # Normalize response text
-        response_lower = response_text.lower()
-        response_lines = response_text.split("\n")
-
-        for scenario in scenarios:
-            scenario_name = scenario["name"]
-            scenario_lower = scenario_name.lower()
-
-            # Check multiple pass indicators
-            pass_indicators = [
-                f" {scenario_lower}",
-                f"{scenario_lower} ",
-                f"{scenario_lower}: passed",
-                f"{scenario_lower} passed",
-                f"{scenario_lower}: success",
-                f"successfully completed {scenario_lower}",
-                "all tests passed" in response_lower and scenario_lower in response_lower,
-            ]
-
-            # Check multiple fail indicators
-            fail_indicators = [
-                f" {scenario_lower}",
-                f"{scenario_lower} ",
-                f"{scenario_lower}: failed",
-                f"{scenario_lower} failed",
-                f"{scenario_lower}: error",
-                f"failed {scenario_lower}",
-            ]
-
-            passed = any(indicator if isinstance(indicator, bool) else indicator in response_lower
-                        for indicator in pass_indicators)
-
-            failed = any(indicator in response_lower for indicator in fail_indicators)
 
-            # If both passed and failed indicators, prefer failed
-            if failed:
-                passed = False
+        names, names_pattern, names_by_first_char = _scenario_matcher(
+            tuple(scenario["name"] for scenario in scenarios)
+        )
+        mentioned = [False] * len(names)
+        passed = [False] * len(names)
+        failed = [False] * len(names)
+
+        # One scan over the response for every scenario name occurrence;
+        # verdict markers are then checked right around each occurrence
+        if names_pattern is not None:
+            for match in names_pattern.finditer(response_folded):
+                start = match.start()
+
+                for idx in names_by_first_char[response_folded[start]]:
+                    scenario_folded = names[idx]
+                    if not response_folded.startswith(scenario_folded, start):
+                        continue
+
+                    mentioned[idx] = True
+
+                    # A fail indicator overrides any pass indicator, so once
+                    # one is seen the scenario's remaining occurrences only
+                    # need to be skipped
+                    if failed[idx]:
+                        continue
+
+                    end = start + len(scenario_folded)
+
+                    if (response_folded.endswith(_FAIL_PREFIXES, 0, start)
+                            or response_folded.startswith(_FAIL_SUFFIXES, end)):
+                        failed[idx] = True
+                    elif not passed[idx] and (
+                            response_folded.endswith(_PASS_PREFIXES, 0, start)
+                            or response_folded.startswith(_PASS_SUFFIXES, end)):
+                        passed[idx] = True
+
+        # The blanket "all tests passed" only matters for scenarios that were
+        # mentioned without a verdict of their own, so only search for it then
+        all_tests_passed = (
+            any(is_mentioned and not is_passed for is_mentioned, is_passed in zip(mentioned, passed))
+            and "all tests passed" in response_folded
+        )
 
-            # Extract failure reason if failed
-            failure_reason = None
-            if failed:
-                # Try to find the failure line
-                for line in response_lines:
-                    if scenario_lower in line.lower() and ("failed" in line.lower() or "error" in line.lower()):
-                        failure_reason = line.strip()
-                        break
+        # Lines that start a failure block. Scenario failure reasons may come
+        # from any of them; the failure details only need the first 5, plus
+        # a 6th marking where the 5th block ends.
+        scenario_failed = any(failed)
+        failure_matches = []
+        if scenario_failed or test_failed:
+            failure_matches = list(islice(
+                _FAILURE_LINE_RE.finditer(response_text), None if scenario_failed else 6
+            ))
 
-            results.append({
-                "name": scenario_name,
+        # Candidates for a scenario's failure reason, as (line, casefolded line)
+        failure_lines = []
+        if scenario_failed:
+            for match in failure_matches:
+                line = match.group()
+                line_folded = line.casefold()
+                if "failed" in line_folded or "error" in line_folded:
+                    failure_lines.append((line, line_folded))
+
+        # Extract failure reasons for failed scenarios: the first failure
+        # line naming the scenario
+        failure_reasons = {}
+        for idx in (idx for idx, is_failed in enumerate(failed) if is_failed):
+            scenario_folded = names[idx]
+            for line, line_folded in failure_lines:
+                if scenario_folded in line_folded:
+                    failure_reasons[idx] = line.strip()
+                    break
+
+        # If both passed and failed indicators, prefer failed
+        verdicts = [
+            not is_failed and (is_passed or (all_tests_passed and is_mentioned))
+            for is_mentioned, is_passed, is_failed in zip(mentioned, passed, failed)
+        ]
+
+        results = [
+            {
+                "name": scenario["name"],
                 "priority": scenario["priority"],
-                "passed": passed,
-                "failure_reason": failure_reason or ("Test failed or not executed" if not passed else None),
-                "mentioned": scenario_lower in response_lower
-            })
+                "passed": scenario_passed,
+                "failure_reason": failure_reasons.get(idx) or (None if scenario_passed else "Test failed or not executed"),
+                "mentioned": is_mentioned
+            }
+            for idx, (scenario, is_mentioned, scenario_passed) in enumerate(zip(scenarios, mentioned, verdicts))
+        ]
 
-        return results
+        if not test_failed:
+            return results, []
 
-    def _extract_failures(self, response_text: str) -> List[Dict[str, Any]]:
-        """Extract failure details from agent response."""
+        # Only the first 5 failures are reported
         failures = []
+        for i, match in enumerate(failure_matches[:5]):
+            block_end = failure_matches[i + 1].start() if i + 1 < len(failure_matches) else len(response_text)
+            line = match.group().strip()
+
+            # Following non-blank lines belong to this failure
+            details = [
+                detail.strip()
+                for detail in response_text[match.end():block_end].split("\n")
+                if detail.strip()
+            ]
 
-        # Look for common failure patterns
-        lines = response_text.split("\n")
-        current_failure = None
-
-        for line in lines:
-            if "" in line or "failed" in line.lower() or "error" in line.lower():
-                if current_failure:
-                    failures.append(current_failure)
-
-                current_failure = {
-                    "scenario": line.strip(),
-                    "error": line.strip()
-                }
-            elif current_failure and line.strip():
-                # Append to current failure
-                current_failure["error"] += f"\n{line.strip()}"
-
-        if current_failure:
-            failures.append(current_failure)
+            failures.append({
+                "scenario": line,
+                "error": "\n".join([line, *details])
+            })
 
-        return failures[:5]  # Limit to 5 failures
+        return results, failures
 
     def _format_backend_test_slack_summary(self, backend_result: dict, parsed_request) -> str:
         """
@@ -848,47 +1251,44 @@ class TestGPTEngine:
         Returns:
             Formatted Slack message string
         """
-        lines = []
+        completed = backend_result["status"] == "completed"
 
         # Header
-        if backend_result["status"] == "completed":
-            lines.append(" **Backend API Testing Completed**\n")
+        if completed:
+            header = " **Backend API Testing Completed**\n"
         else:
-            lines.append(" **Backend API Testing Failed**\n")
+            header = " **Backend API Testing Failed**\n"
 
         # Test details
         if backend_result.get("repo_url"):
-            lines.append(f"**Repository:** {backend_result['repo_url']}")
+            source = f"**Repository:** {backend_result['repo_url']}\n"
         elif backend_result.get("api_path"):
-            lines.append(f"**API Path:** {backend_result['api_path']}")
-
-        lines.append(f"**App Module:** {backend_result.get('app_module', 'main:app')}")
-        lines.append(f"**Duration:** {backend_result['duration_ms']}ms\n")
+            source = f"**API Path:** {backend_result['api_path']}\n"
+        else:
+            source = ""
 
         # Results
-        if backend_result["status"] == "completed":
-            lines.append("**Test Results:**")
-            lines.append("```")
-            lines.append(backend_result["result"])
-            lines.append("```\n")
+        if completed:
+            results = f"**Test Results:**\n```\n{backend_result['result']}\n```\n"
         else:
-            lines.append("**Error:**")
-            lines.append("```")
-            lines.append(backend_result.get("error", "Unknown error"))
-            lines.append("```\n")
+            results = f"**Error:**\n```\n{backend_result.get('error', 'Unknown error')}\n```\n"
 
             if backend_result.get("error_traceback"):
-                lines.append("**Traceback:**")
-                lines.append("```")
-                lines.append(backend_result["error_traceback"])
-                lines.append("```\n")
-
-        # Footer
-        lines.append("---")
-        lines.append(f" *TestGPT Backend API Testing*")
-        lines.append(f"⏱  *Completed at:* {backend_result['completed_at'].strftime('%Y-%m-%d %H:%M:%S')}")
-
-        return "\n".join(lines)
+                results += f"\n**Traceback:**\n```\n{backend_result['error_traceback']}\n```\n"
+
+        completed_at = backend_result['completed_at'].strftime('%Y-%m-%d %H:%M:%S')
+
+        return (
+            f"{header}\n"
+            f"{source}"
+            f"**App Module:** {backend_result.get('app_module', 'main:app')}\n"
+            f"**Duration:** {backend_result['duration_ms']}ms\n\n"
+            f"{results}\n"
+            # Footer
+            "---\n"
+            " *TestGPT Backend API Testing*\n"
+            f"⏱  *Completed at:* {completed_at}"
+        )
 
     def _save_execution_to_database(self, run_artifact: RunArtifact, test_plan: TestPlan):
         """
@@ -899,124 +1299,141 @@ class TestGPTEngine:
             test_plan: Original test plan with test suite info
         """
         try:
-            db = SessionLocal()
-
-            # First, check if test suite exists in database
-            test_suite_id = None
-            existing_suite = crud.get_test_suite_by_name(db, run_artifact.scenario_name)
-
-            if not existing_suite:
-                # Create test suite if it doesn't exist
-                # Extract test steps from test plan if available
-                test_steps = []
-                if hasattr(test_plan, 'test_steps') and test_plan.test_steps:
-                    test_steps = [
-                        TestStepSchema(
-                            step_number=i+1,
-                            action=step.get('action', 'unknown'),
-                            target=step.get('target', ''),
-                            expected_outcome=step.get('expected_outcome', ''),
-                            timeout_seconds=step.get('timeout_seconds', 30)
-                        )
-                        for i, step in enumerate(test_plan.test_steps)
-                    ]
-
-                suite_create = TestSuiteCreate(
-                    name=run_artifact.scenario_name,
-                    description=f"Test suite for {run_artifact.target_url}",
-                    prompt=f"Automated test for {run_artifact.scenario_name}",
-                    target_url=run_artifact.target_url,
-                    test_steps=test_steps,
-                    created_by=run_artifact.triggered_by,
-                    source_type="slack_trigger",
-                    tags=[]
-                )
+            # The session (and its pooled connection) is released when the
+            # block exits, whether or not the save succeeded
+            with SessionLocal() as db:
+                # First, check if test suite exists in database
+                test_suite_id = self._suite_ids.get(run_artifact.scenario_name)
+                if test_suite_id is not None and db.get(TestSuite, test_suite_id) is None:
+                    test_suite_id = None
+                existing_suite = None
+                if test_suite_id is None:
+                    existing_suite = crud.get_test_suite_by_name(db, run_artifact.scenario_name)
+
+                if test_suite_id is not None:
+                    log.info("    Using existing test suite: %s", test_suite_id)
+                elif not existing_suite:
+                    # Create test suite if it doesn't exist
+                    # Extract test steps from test plan if available
+                    test_steps = []
+                    if hasattr(test_plan, 'test_steps') and test_plan.test_steps:
+                        test_steps = [
+                            TestStepSchema(
+                                step_number=i+1,
+                                action=step.get('action', 'unknown'),
+                                target=step.get('target', ''),
+                                expected_outcome=step.get('expected_outcome', ''),
+                                timeout_seconds=step.get('timeout_seconds', 30)
+                            )
+                            for i, step in enumerate(test_plan.test_steps)
+                        ]
+
+                    suite_create = TestSuiteCreate(
+                        name=run_artifact.scenario_name,
+                        description=f"Test suite for {run_artifact.target_url}",
+                        prompt=f"Automated test for {run_artifact.scenario_name}",
+                        target_url=run_artifact.target_url,
+                        test_steps=test_steps,
+                        created_by=run_artifact.triggered_by,
+                        source_type="slack_trigger",
+                        tags=[]
+                    )
+
+                    new_suite = crud.create_test_suite(db, suite_create)
+                    test_suite_id = new_suite.id
+                    log.info("    Created test suite: %s", test_suite_id)
+                else:
+                    test_suite_id = existing_suite.id
+                    log.info("    Using existing test suite: %s", test_suite_id)
 
-                new_suite = crud.create_test_suite(db, suite_create)
-                test_suite_id = new_suite.id
-                print(f"    Created test suite: {test_suite_id}")
-            else:
-                test_suite_id = existing_suite.id
-                print(f"    Using existing test suite: {test_suite_id}")
-
-            # Determine status based on run_artifact.overall_status
-            status_map = {
-                TestStatus.PASS: "passed",
-                TestStatus.FAIL: "failed",
-                TestStatus.TIMED_OUT: "failed"
-            }
-            status = status_map.get(run_artifact.overall_status, "failed")
-
-            # Extract browser and viewport info from first cell result if available
-            browser = "chromium"
-            viewport_width = 1920
-            viewport_height = 1080
-            network_mode = "normal"
-
-            if run_artifact.cell_results and len(run_artifact.cell_results) > 0:
-                first_cell = run_artifact.cell_results[0]
-                browser = first_cell.browser_config.profile_name if hasattr(first_cell, 'browser_config') else "chromium"
-                if hasattr(first_cell, 'viewport_config'):
-                    viewport_width = first_cell.viewport_config.width
-                    viewport_height = first_cell.viewport_config.height
-                if hasattr(first_cell, 'network_config'):
-                    network_mode = first_cell.network_config.profile_name if first_cell.network_config.profile_name else "normal"
-
-            # Create execution record
-            execution_create = TestExecutionCreate(
-                test_suite_id=test_suite_id,
-                config_id=None,  # No config template for Slack-triggered tests
-                browser=browser,
-                viewport_width=viewport_width,
-                viewport_height=viewport_height,
-                network_mode=network_mode,
-                triggered_by="slack",
-                triggered_by_user=run_artifact.triggered_by
-            )
+                self._suite_ids[run_artifact.scenario_name] = test_suite_id
 
-            execution = crud.create_test_execution(db, execution_create)
-
-            # Update execution with completion details
-            execution.status = status
-            execution.started_at = run_artifact.started_at
-            execution.completed_at = run_artifact.completed_at
-            execution.execution_time_ms = run_artifact.duration_total_seconds * 1000
-
-            # Store execution logs as JSON
-            execution_logs = []
-            for cell_result in run_artifact.cell_results:
-                log_entry = {
-                    "cell_id": cell_result.cell_id,
-                    "status": cell_result.status.value,
-                    "browser": browser,
-                    "viewport": f"{viewport_width}x{viewport_height}",
-                    "network": network_mode
+                # Determine status based on run_artifact.overall_status
+                status_map = {
+                    TestStatus.PASS: "passed",
+                    TestStatus.FAIL: "failed",
+                    TestStatus.TIMEOUT: "failed"
                 }
-                if cell_result.error_message:
-                    log_entry["error"] = cell_result.error_message
-                execution_logs.append(log_entry)
-
-            import json
-            execution.execution_logs = json.dumps(execution_logs)
-
-            # Store error details if test failed
-            if status == "failed":
-                error_messages = []
-                for cell_result in run_artifact.cell_results:
-                    if cell_result.error_message:
-                        error_messages.append(f"{cell_result.cell_id}: {cell_result.error_message}")
-                if error_messages:
-                    execution.error_details = "\n".join(error_messages)
+                status = status_map.get(run_artifact.overall_status, "failed")
+
+                # Extract browser and viewport info from first cell result if available
+                browser = "chromium"
+                viewport_width = 1920
+                viewport_height = 1080
+                network_mode = "normal"
+
+                if run_artifact.cell_results:
+                    first_cell = run_artifact.cell_results[0]
+                    browser_config = getattr(first_cell, 'browser_config', None)
+                    viewport_config = getattr(first_cell, 'viewport_config', None)
+                    network_config = getattr(first_cell, 'network_config', None)
+
+                    if browser_config is not None:
+                        browser = browser_config.profile_name
+                    if viewport_config is not None:
+                        viewport_width = viewport_config.width
+                        viewport_height = viewport_config.height
+                    if network_config is not None:
+                        network_mode = network_config.profile_name or "normal"
+
+                # Create execution record
+                execution_create = TestExecutionCreate(
+                    test_suite_id=test_suite_id,
+                    config_id=None,  # No config template for Slack-triggered tests
+                    browser=browser,
+                    viewport_width=viewport_width,
+                    viewport_height=viewport_height,
+                    network_mode=network_mode,
+                    triggered_by="slack",
+                    triggered_by_user=run_artifact.triggered_by
+                )
 
-            db.commit()
-            db.refresh(execution)
+                # Store execution logs as JSON
+                viewport = f"{viewport_width}x{viewport_height}"
+                execution_logs = [
+                    {
+                        "cell_id": cell_result.cell_id,
+                        "status": cell_result.status.value,
+                        "browser": browser,
+                        "viewport": viewport,
+                        "network": network_mode,
+                        **({"error": cell_result.error_message} if cell_result.error_message else {})
+                    }
+                    for cell_result in run_artifact.cell_results
+                ]
+
+                execution_logs_json = json_dumps(execution_logs).decode()
+
+                # Store error details if test failed
+                error_details = None
+                if status == "failed":
+                    error_messages = []
+                    for cell_result in run_artifact.cell_results:
+                        if cell_result.error_message:
+                            error_messages.append(f"{cell_result.cell_id}: {cell_result.error_message}")
+                    if error_messages:
+                        error_details = "\n".join(error_messages)
+
+                # The execution is already complete, so it is inserted with
+                # its results in one statement
+                execution_id = crud.create_completed_test_execution(
+                    db,
+                    execution_create,
+                    status=status,
+                    started_at=run_artifact.started_at,
+                    completed_at=run_artifact.completed_at,
+                    execution_time_ms=run_artifact.duration_total_seconds * 1000,
+                    execution_logs=execution_logs_json,
+                    error_details=error_details
+                )
 
-            print(f"    Saved execution to database: {execution.id}")
-            print(f"    Status: {status}, Suite ID: {test_suite_id}")
+                log.info("    Saved execution to database: %s", execution_id)
+                log.info("    Status: %s, Suite ID: %s", status, test_suite_id)
 
         except Exception as e:
-            print(f"     Warning: Failed to save execution to database: {e}")
-            import traceback
-            traceback.print_exc()
-        finally:
-            db.close()
+            # Don't trust the cached suite after a failed save; look it up
+            # again next time
+            self._suite_ids.pop(run_artifact.scenario_name, None)
+            # The traceback goes through the engine's log handler, in the
+            # same single write as the warning
+            log.warning("     Warning: Failed to save execution to database: %s", e, exc_info=True)
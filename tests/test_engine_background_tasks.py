@@ -0,0 +1,97 @@
+"""
+Unit tests for the engine's background task tracking.
+"""
+
+import pytest
+import asyncio
+import threading
+
+
+# Test imports
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+pytest.importorskip("agno")
+pytest.importorskip("sqlalchemy")
+
+import testgpt_engine
+
+
+def _engine_with_task_tracking():
+    """Build an engine with only the background task tracking set up."""
+    # Imported via the module so pytest doesn't try to collect the class
+    engine = testgpt_engine.TestGPTEngine.__new__(testgpt_engine.TestGPTEngine)
+    engine._background_tasks = set()
+    engine._background_tasks_lock = threading.Lock()
+    return engine
+
+
+class TestDrain:
+    """Tests for TestGPTEngine.drain."""
+
+    def test_drain_waits_for_background_tasks(self):
+        """Test drain returns only once the loop's background work is done."""
+        engine = _engine_with_task_tracking()
+        finished = []
+
+        async def background():
+            await asyncio.sleep(0.01)
+            finished.append(True)
+
+        async def main():
+            engine._run_in_background(background())
+            await engine.drain()
+
+        asyncio.run(main())
+
+        assert finished == [True]
+        assert engine._background_tasks == set()
+
+    def test_drain_only_awaits_own_loop(self):
+        """Test a shared engine drains per event loop, across threads."""
+        engine = _engine_with_task_tracking()
+        first_started = threading.Event()
+        second_done = threading.Event()
+        outcomes = {}
+
+        async def first_loop():
+            release = asyncio.Event()
+            engine._run_in_background(release.wait())
+            first_started.set()
+
+            # Keep this loop's task pending until the other thread drained
+            await asyncio.to_thread(second_done.wait, 5)
+            outcomes["first_pending_during_second_drain"] = not release.is_set()
+            release.set()
+            await engine.drain()
+
+        async def second_loop():
+            engine._run_in_background(asyncio.sleep(0))
+            await engine.drain()
+
+        def run_first():
+            try:
+                asyncio.run(first_loop())
+            except Exception as e:
+                outcomes["first_error"] = e
+
+        def run_second():
+            first_started.wait(5)
+            try:
+                asyncio.run(second_loop())
+            except Exception as e:
+                outcomes["second_error"] = e
+            finally:
+                second_done.set()
+
+        threads = [threading.Thread(target=run_first), threading.Thread(target=run_second)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(10)
+
+        assert "first_error" not in outcomes
+        assert "second_error" not in outcomes
+        assert outcomes["first_pending_during_second_drain"] is True
+        assert engine._background_tasks == set()
@@ -0,0 +1,165 @@
+"""
+Unit tests for parsing PR test agent responses.
+"""
+
+import pytest
+
+
+# Test imports
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+pytest.importorskip("agno")
+pytest.importorskip("sqlalchemy")
+
+import testgpt_engine
+from testgpt_engine import _pr_verdict, _PR_VERDICT_HEAD_CHARS, _PR_VERDICT_TAIL_CHARS
+
+
+def _pr_context(*names):
+    """Build a PR context with the given test scenario names."""
+    return {
+        "test_context": {
+            "test_scenarios": [{"name": name, "priority": "high"} for name in names]
+        }
+    }
+
+
+def _parse(response_text, pr_context, test_failed=False):
+    """Run _parse_response, which uses no engine state."""
+    # Imported via the module so pytest doesn't try to collect the class
+    engine = testgpt_engine.TestGPTEngine.__new__(testgpt_engine.TestGPTEngine)
+    return engine._parse_response(response_text, response_text.casefold(), pr_context, test_failed)
+
+
+class TestPRVerdict:
+    """Tests for the whole-response pass/fail verdict."""
+
+    def test_pass_only(self):
+        """Test a response with only pass indicators."""
+        assert _pr_verdict("all tests passed ✅") == (True, False)
+
+    def test_fail_only(self):
+        """Test a response with only fail indicators."""
+        assert _pr_verdict("login failed") == (False, True)
+
+    def test_both(self):
+        """Test a response with pass and fail indicators."""
+        assert _pr_verdict("checkout ❌, search ✅") == (True, True)
+
+    def test_neither(self):
+        """Test a response with no indicators."""
+        assert _pr_verdict("the page loaded") == (False, False)
+
+    def test_failing_response_not_reported_passed(self):
+        """Test a response without pass indicators doesn't count as passed.
+
+        Regression: the ✅/❌ indicators used to be empty strings, which match
+        any text, so every response was both passed and failed.
+        """
+        test_passed, test_failed = _pr_verdict("checkout flow failed: button not found")
+
+        assert test_passed is False
+        assert test_failed is True
+
+    def test_passing_response_not_reported_failed(self):
+        """Test a response without fail indicators doesn't count as failed."""
+        test_passed, test_failed = _pr_verdict("all scenarios passed")
+
+        assert test_passed is True
+        assert test_failed is False
+
+    def test_long_response_checks_head_and_tail(self):
+        """Test indicators at either end of a long response are found."""
+        filler = "x" * (_PR_VERDICT_HEAD_CHARS + _PR_VERDICT_TAIL_CHARS)
+
+        assert _pr_verdict("success " + filler) == (True, False)
+        assert _pr_verdict(filler + " failed") == (False, True)
+
+    def test_long_response_skips_middle(self):
+        """Test indicators between the head and tail of a long response are ignored."""
+        response = "x" * _PR_VERDICT_HEAD_CHARS + " failed " + "x" * _PR_VERDICT_TAIL_CHARS
+
+        assert _pr_verdict(response) == (False, False)
+
+    def test_truncation_seam_does_not_form_indicator(self):
+        """Test an indicator can't be formed by joining the head and tail."""
+        response = "x" * (_PR_VERDICT_HEAD_CHARS - 3) + "fai" + "y" * 100 + "led" + "z" * (_PR_VERDICT_TAIL_CHARS - 3)
+
+        assert _pr_verdict(response) == (False, False)
+
+
+class TestParseResponseScenarios:
+    """Tests for per-scenario pass/fail detection."""
+
+    def test_fail_indicator_overrides_pass(self):
+        """Test a scenario reported both passed and failed counts as failed."""
+        response = "✅ Login flow\nLater: ❌ Login flow"
+
+        results, _ = _parse(response, _pr_context("Login flow"))
+
+        assert results[0]["passed"] is False
+        assert results[0]["mentioned"] is True
+
+    def test_pass_and_fail_suffixes(self):
+        """Test verdicts written after the scenario name."""
+        response = "Login flow: passed\nCheckout flow: failed"
+
+        results, _ = _parse(response, _pr_context("Login flow", "Checkout flow"))
+
+        assert [result["passed"] for result in results] == [True, False]
+        assert results[1]["failure_reason"] == "Checkout flow: failed"
+
+    def test_all_tests_passed_covers_mentioned_scenarios(self):
+        """Test "all tests passed" passes scenarios mentioned without a verdict."""
+        response = "Ran Login flow and Search.\nAll tests passed."
+
+        results, _ = _parse(response, _pr_context("Login flow", "Search", "Checkout flow"))
+
+        assert [result["passed"] for result in results] == [True, True, False]
+        assert results[2]["mentioned"] is False
+        assert results[2]["failure_reason"] == "Test failed or not executed"
+
+    def test_all_tests_passed_does_not_override_failure(self):
+        """Test "all tests passed" doesn't pass a scenario reported failed."""
+        response = "❌ Login flow\nAll tests passed."
+
+        results, _ = _parse(response, _pr_context("Login flow"))
+
+        assert results[0]["passed"] is False
+
+
+class TestParseResponseFailures:
+    """Tests for extracting failure details."""
+
+    def test_no_failures_unless_test_failed(self):
+        """Test failure details are only extracted for a failed run."""
+        _, failures = _parse("step 1 failed", _pr_context(), test_failed=False)
+
+        assert failures == []
+
+    def test_only_first_five_failures(self):
+        """Test at most 5 failure blocks are reported, each with its detail lines."""
+        response = "\n".join(
+            f"❌ Step {i} failed\n  detail {i}\n" for i in range(1, 8)
+        )
+
+        _, failures = _parse(response, _pr_context(), test_failed=True)
+
+        assert [failure["scenario"] for failure in failures] == [
+            f"❌ Step {i} failed" for i in range(1, 6)
+        ]
+        # The 5th block ends where the 6th starts
+        assert failures[4]["error"] == "❌ Step 5 failed\ndetail 5"
+
+    def test_last_block_runs_to_end(self):
+        """Test the final failure block takes every remaining non-blank line."""
+        response = "Summary\n❌ Checkout failed\n  timeout\n\n  retried twice\n"
+
+        _, failures = _parse(response, _pr_context(), test_failed=True)
+
+        assert failures == [{
+            "scenario": "❌ Checkout failed",
+            "error": "❌ Checkout failed\ntimeout\nretried twice"
+        }]
@@ -0,0 +1,97 @@
+"""
+Unit tests for the keyword fast path of the Claude viewport parser.
+"""
+
+import pytest
+from unittest.mock import Mock, patch
+
+
+# Test imports
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+pytest.importorskip("anthropic")
+
+from viewport_parser_claude import ClaudeViewportParser
+
+
+@pytest.fixture
+def parser_and_client():
+    """Parser whose Anthropic client is a mock that answers with the defaults."""
+    with patch("viewport_parser_claude._anthropic_client") as client_factory:
+        client = client_factory.return_value
+        client.messages.create.return_value.content = [Mock(
+            text='{"viewports": ["desktop-standard"], "browsers": ["chromium-desktop"], "networks": ["normal"]}'
+        )]
+        yield ClaudeViewportParser(), client
+
+
+class TestKeywordFastPath:
+    """Requests the parsing rules settle on their own skip the Claude call."""
+
+    @pytest.mark.parametrize("message, expected", [
+        (
+            "test on iPhone",
+            {"viewports": ["iphone-13-pro"], "browsers": ["webkit-ios"], "networks": ["normal"]}
+        ),
+        (
+            "test on iPhone and desktop",
+            {
+                "viewports": ["iphone-13-pro", "desktop-standard"],
+                "browsers": ["webkit-ios", "chromium-desktop"],
+                "networks": ["normal"]
+            }
+        ),
+        (
+            "responsive test with slow network",
+            {
+                "viewports": ["iphone-13-pro", "ipad-air", "desktop-standard"],
+                "browsers": ["webkit-ios", "chromium-desktop"],
+                "networks": ["normal", "slow-3g"]
+            }
+        ),
+        (
+            "cross-browser test",
+            {
+                "viewports": ["desktop-standard"],
+                "browsers": ["chromium-desktop", "webkit-desktop"],
+                "networks": ["normal"]
+            }
+        ),
+    ])
+    def test_prompt_examples(self, parser_and_client, message, expected):
+        """Test the prompt's own examples are answered without Claude."""
+        parser, client = parser_and_client
+
+        assert parser.parse_environments(message) == expected
+        client.messages.create.assert_not_called()
+
+    @pytest.mark.parametrize("message", [
+        "check pricing on desktop, it feels slow to load",
+        "test the mobile menu on desktop",
+        "desktop - the 3G banner should hide",
+        "test on iPhone SE",
+        "test on ultrawide desktop",
+        "test on a small desktop",
+    ])
+    def test_context_dependent_wording_goes_to_claude(self, parser_and_client, message):
+        """Test wording the keyword rules can't settle on their own defers to Claude.
+
+        Covers slow/3G not about the network, descriptive "mobile", and
+        qualifiers naming a more specific configured profile.
+        """
+        parser, client = parser_and_client
+
+        parser.parse_environments(message)
+
+        client.messages.create.assert_called_once()
+
+    def test_keywords_in_urls_are_ignored(self, parser_and_client):
+        """Test a keyword inside the target URL doesn't pick a profile."""
+        parser, client = parser_and_client
+
+        result = parser.parse_environments("test https://mobile.example.com on desktop")
+
+        assert result["viewports"] == ["desktop-standard"]
+        client.messages.create.assert_not_called()
@@ -6,9 +6,79 @@ from natural language Slack messages.
 """
 
 import os
+import re
 import json
-from typing import Dict, List
+from functools import lru_cache
+from typing import Dict, List, Optional
 from anthropic import Anthropic
+from json_utils import json_loads
+
+
+# URLs and domains, which may contain keywords ("mobile.example.com")
+_URL_LIKE_RE = re.compile(r"\S*(?:://|\w\.\w)\S*")
+
+# Keywords the PARSING RULES in the prompt map to profiles deterministically
+_ENV_KEYWORD_RE = re.compile(
+    r"\b(iphone|ios|mobile|ipad|tablet|desktop|responsive|chrome|chromium|firefox|cross-browser)\b",
+    re.IGNORECASE
+)
+
+# "slow"/"3G"/"poor" only ask for slow-3g when they describe the network;
+# on their own they may describe the page ("feels slow", "the 3G banner")
+_SLOW_NETWORK_RE = re.compile(
+    r"\b(?:slow|3g|poor)[\s-]+(?:network|connection|connectivity|internet)s?\b",
+    re.IGNORECASE
+)
+
+# Words whose meaning depends on context (platform-dependent browsers,
+# unlisted devices or networks, "mobile" describing something rather than
+# naming the target, negations), so Claude has to decide. Matched after
+# slow network phrases are removed, so leftover slow/3G wording is here too
+_ENV_AMBIGUOUS_RE = re.compile(
+    r"\b(safari|webkit|android|brave|edge|mac|macos|windows|linux|comprehensive|all|every"
+    r"|slow|poor|flaky|unstable|packet|lossy|offline|bad|latency|throttl\w*|[2-5]g|wifi"
+    r"|mobile(?=[\s-]+(?!and\b|or\b)\w)"
+    r"|devices?|screens?|viewports?|landscape|portrait|resolutions?|(?<!cross-)browsers?"
+    r"|not|no|without|except|exclude|skip|only)\b",
+    re.IGNORECASE
+)
+
+_VIEWPORTS_BY_KEYWORD = {
+    "iphone": ("iphone-13-pro",),
+    "ios": ("iphone-13-pro",),
+    "mobile": ("iphone-13-pro",),
+    "ipad": ("ipad-air",),
+    "tablet": ("ipad-air",),
+    "desktop": ("desktop-standard",),
+    "responsive": ("iphone-13-pro", "ipad-air", "desktop-standard"),
+}
+
+_BROWSERS_BY_KEYWORD = {
+    "chrome": ("chromium-desktop",),
+    "chromium": ("chromium-desktop",),
+    "firefox": ("firefox-desktop",),
+    "cross-browser": ("chromium-desktop", "webkit-desktop"),
+}
+
+# Output order for matched viewports, matching the prompt's examples
+_VIEWPORT_ORDER = ("iphone-13-pro", "ipad-air", "desktop-standard")
+_MOBILE_VIEWPORTS = frozenset(("iphone-13-pro", "ipad-air"))
+
+
+@lru_cache(maxsize=1)
+def _load_available_config() -> dict:
+    """Load available viewports/browsers/networks from config.json (once per process)."""
+    config_path = os.path.join(os.path.dirname(__file__), "config.json")
+    if os.path.exists(config_path):
+        with open(config_path, 'r') as f:
+            return json.load(f)
+    return {}
+
+
+@lru_cache(maxsize=1)
+def _anthropic_client() -> Anthropic:
+    """Shared Anthropic client, so its connection pool is reused across parses."""
+    return Anthropic(api_key=os.environ.get("ANTHROPIC_API_KEY"))
 
 
 class ClaudeViewportParser:
@@ -20,16 +90,16 @@ class ClaudeViewportParser:
     """
 
     def __init__(self):
-        self.client = Anthropic(api_key=os.environ.get("ANTHROPIC_API_KEY"))
-        self.available_config = self._load_available_config()
+        self.client = _anthropic_client()
+        self.available_config = _load_available_config()
 
-    def _load_available_config(self) -> dict:
-        """Load available viewports/browsers/networks from config.json."""
-        config_path = os.path.join(os.path.dirname(__file__), "config.json")
-        if os.path.exists(config_path):
-            with open(config_path, 'r') as f:
-                return json.load(f)
-        return {}
+        # Words that name a more specific configured profile than the
+        # keyword rules would pick
+        self._profile_qualifier_re = self._build_profile_qualifier_re()
+
+        # Everything in the prompt after the request itself depends only on
+        # the config, so it is rendered once
+        self._static_prompt = self._build_static_prompt()
 
     def parse_environments(self, slack_message: str, target_url: str = "") -> Dict[str, List[str]]:
         """
@@ -51,6 +121,11 @@ class ClaudeViewportParser:
                 "networks": ["normal"]
             }
         """
+        # Requests the parsing rules settle on their own skip the API call
+        matched = self._match_keywords(slack_message)
+        if matched is not None:
+            return matched
+
         # Build prompt with available options
         prompt = self._build_parsing_prompt(slack_message, target_url)
 
@@ -70,9 +145,10 @@ class ClaudeViewportParser:
         # Extract JSON from response
         response_text = response.content[0].text
 
-        # Parse JSON response
+        # Parse JSON response, ignoring any prose around the object
+        json_text = response_text[response_text.find("{"):response_text.rfind("}") + 1]
         try:
-            result = json.loads(response_text)
+            result = json_loads(json_text)
 
             # Validate and set defaults
             return {
@@ -90,8 +166,95 @@ class ClaudeViewportParser:
                 "networks": ["normal"]
             }
 
+    def _match_keywords(self, slack_message: str) -> Optional[Dict[str, List[str]]]:
+        """
+        Apply the prompt's parsing rules directly for unambiguous requests.
+
+        Returns:
+            The parsed environments, or None if Claude should decide (no
+            environment keywords, context-dependent wording, a browser asked
+            for on a mobile viewport, or profiles missing from config.json)
+        """
+        text = _URL_LIKE_RE.sub(" ", slack_message)
+        hits = {match.lower() for match in _ENV_KEYWORD_RE.findall(text)}
+        slow_network = _SLOW_NETWORK_RE.search(text) is not None
+        if not (hits or slow_network):
+            return None
+
+        remaining = _SLOW_NETWORK_RE.sub(" ", text)
+        if _ENV_AMBIGUOUS_RE.search(remaining):
+            return None
+        if self._profile_qualifier_re is not None and self._profile_qualifier_re.search(remaining):
+            return None
+
+        viewport_set = {vp for hit in hits for vp in _VIEWPORTS_BY_KEYWORD.get(hit, ())}
+        viewports = [vp for vp in _VIEWPORT_ORDER if vp in viewport_set] or ["desktop-standard"]
+        has_mobile = any(vp in _MOBILE_VIEWPORTS for vp in viewports)
+
+        browsers = []
+        for hit in ("chrome", "chromium", "firefox", "cross-browser"):
+            if hit in hits:
+                browsers.extend(br for br in _BROWSERS_BY_KEYWORD[hit] if br not in browsers)
+
+        if browsers:
+            # Which browser to run on a phone or tablet is a judgement call
+            if has_mobile:
+                return None
+        else:
+            # Match browsers to viewports: WebKit on iOS devices, Chromium on desktop
+            if has_mobile:
+                browsers.append("webkit-ios")
+            if "desktop-standard" in viewports:
+                browsers.append("chromium-desktop")
+
+        networks = ["normal"]
+        if slow_network:
+            networks.append("slow-3g")
+
+        result = {"viewports": viewports, "browsers": browsers, "networks": networks}
+
+        # Only answer with profiles this deployment actually defines
+        for kind, names in result.items():
+            available = self.available_config.get(kind, {})
+            if any(name not in available for name in names):
+                return None
+
+        return result
+
+    def _build_profile_qualifier_re(self) -> Optional[re.Pattern]:
+        """
+        Build a pattern for words from the configured profile names and
+        display names, other than the keywords the parsing rules map
+        themselves (e.g. "se", "ultrawide", "small"). A request using one
+        may want a more specific profile than the keyword rules pick, so
+        Claude decides.
+        """
+        words = set()
+        for kind in ("viewports", "browsers", "networks"):
+            for name, profile in self.available_config.get(kind, {}).items():
+                words.update(re.findall(r"[^\W_]+", f"{name} {profile.get('display_name', '')}".casefold()))
+
+        words -= _VIEWPORTS_BY_KEYWORD.keys() | _BROWSERS_BY_KEYWORD.keys()
+        if not words:
+            return None
+
+        # Longest first, so a word isn't cut short by one of its prefixes
+        alternatives = "|".join(map(re.escape, sorted(words, key=len, reverse=True)))
+        return re.compile(rf"\b(?:{alternatives})\b", re.IGNORECASE)
+
     def _build_parsing_prompt(self, slack_message: str, target_url: str) -> str:
         """Build the prompt for Claude to parse environment requirements."""
+        return f"""You are parsing a user's test request to determine which viewports, browsers, and network conditions to test.
+
+USER'S REQUEST:
+"{slack_message}"
+
+TARGET URL: {target_url if target_url else "(not specified)"}
+
+{self._static_prompt}"""
+
+    def _build_static_prompt(self) -> str:
+        """Build the available options, parsing rules and examples part of the prompt."""
 
         # Get available options from config
         viewports = self.available_config.get("viewports", {})
@@ -116,14 +279,7 @@ class ClaudeViewportParser:
             desc = f"- **{net_name}**: {net_config.get('display_name', net_name)} - {net_config.get('description', '')}"
             network_descriptions.append(desc)
 
-        return f"""You are parsing a user's test request to determine which viewports, browsers, and network conditions to test.
-
-USER'S REQUEST:
-"{slack_message}"
-
-TARGET URL: {target_url if target_url else "(not specified)"}
-
-AVAILABLE VIEWPORTS:
+        return f"""AVAILABLE VIEWPORTS:
 {chr(10).join(viewport_descriptions)}
 
 AVAILABLE BROWSERS:
@@ -209,5 +365,10 @@ def parse_environments_with_claude(slack_message: str, target_url: str = "") ->
     Returns:
         Dictionary with viewports, browsers, networks lists
     """
-    parser = ClaudeViewportParser()
-    return parser.parse_environments(slack_message, target_url)
+    return _default_parser().parse_environments(slack_message, target_url)
+
+
+@lru_cache(maxsize=1)
+def _default_parser() -> ClaudeViewportParser:
+    """Parser shared by parse_environments_with_claude, built on first use."""
+    return ClaudeViewportParser()